@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from aws_cdk import (
+    aws_cloudfront as cloudfront,
+    Duration,
+)
+from constructs import Construct
+
+
+@dataclass(frozen=True)
+class ApiCacheBehavior:
+    """Edge caching for one API path pattern (CloudFront syntax, e.g. "/api/results/*").
+
+    Only the listed query strings and headers become part of the cache key and
+    reach the origin. stale_while_revalidate_seconds lets the edge keep serving a
+    cached response while it refetches it in the background.
+    """
+
+    path_pattern: str
+    default_ttl_seconds: int = 60
+    min_ttl_seconds: int = 0
+    max_ttl_seconds: int = 600
+    query_strings: Sequence[str] = ()
+    headers: Sequence[str] = ()
+    stale_while_revalidate_seconds: Optional[int] = None
+
+    def __post_init__(self):
+        if not self.path_pattern.startswith("/"):
+            raise ValueError(f"Cache behavior path pattern must start with '/', got {self.path_pattern!r}")
+        if "*" in self.path_pattern[:-1]:
+            raise ValueError(f"Cache behavior path pattern may only end with '*', got {self.path_pattern!r}")
+        if not self.min_ttl_seconds <= self.default_ttl_seconds <= self.max_ttl_seconds:
+            raise ValueError(f"Cache behavior TTLs for {self.path_pattern} must satisfy min <= default <= max")
+
+    def cache_control(self) -> str:
+        """Cache-Control header the origin returns so CloudFront can serve stale while revalidating."""
+        value = f"public, max-age={self.default_ttl_seconds}"
+        if self.stale_while_revalidate_seconds:
+            value += f", stale-while-revalidate={self.stale_while_revalidate_seconds}"
+        return value
+
+
+class ApiCdn(Construct):
+    """CloudFront distribution in front of the API origin with per-path cache behaviors.
+
+    Everything not matched by a behavior is passed straight through uncached.
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 origin: cloudfront.IOrigin,
+                 behaviors: Sequence[ApiCacheBehavior] = ()) -> None:
+        super().__init__(scope, construct_id)
+
+        additional_behaviors = {}
+        for index, behavior in enumerate(behaviors):
+            cache_policy = cloudfront.CachePolicy(self, f"CachePolicy{index}",
+                comment=f"API cache policy for {behavior.path_pattern}",
+                default_ttl=Duration.seconds(behavior.default_ttl_seconds),
+                min_ttl=Duration.seconds(behavior.min_ttl_seconds),
+                max_ttl=Duration.seconds(behavior.max_ttl_seconds),
+                query_string_behavior=(
+                    cloudfront.CacheQueryStringBehavior.allow_list(*behavior.query_strings)
+                    if behavior.query_strings else cloudfront.CacheQueryStringBehavior.none()
+                ),
+                header_behavior=(
+                    cloudfront.CacheHeaderBehavior.allow_list(*behavior.headers)
+                    if behavior.headers else cloudfront.CacheHeaderBehavior.none()
+                ),
+                cookie_behavior=cloudfront.CacheCookieBehavior.none(),
+                # Normalise Accept-Encoding into the cache key so the edge serves gzip/brotli itself
+                enable_accept_encoding_gzip=True,
+                enable_accept_encoding_brotli=True
+            )
+
+            additional_behaviors[behavior.path_pattern] = cloudfront.BehaviorOptions(
+                origin=origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                allowed_methods=cloudfront.AllowedMethods.ALLOW_GET_HEAD_OPTIONS,
+                cached_methods=cloudfront.CachedMethods.CACHE_GET_HEAD,
+                cache_policy=cache_policy,
+                compress=True
+            )
+
+        # Create CloudFront Distribution; uncached paths forward everything to the origin except
+        # Host, so the origin (and its TLS certificate) sees its own name, not the cloudfront.net one
+        self.distribution = cloudfront.Distribution(self, "Distribution",
+            default_behavior=cloudfront.BehaviorOptions(
+                origin=origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
+                cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,
+                origin_request_policy=cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER
+            ),
+            additional_behaviors=additional_behaviors
+        )
+
+
+def stale_while_revalidate_directives(behavior: ApiCacheBehavior) -> List[str]:
+    """nginx directives replacing the app's Cache-Control for a cached path."""
+    if not behavior.stale_while_revalidate_seconds:
+        return []
+    return [
+        "proxy_hide_header Cache-Control;",
+        f'add_header Cache-Control "{behavior.cache_control()}";',
+    ]
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+APP_MODULE = "api_project.asgi:application"
+
+LOOP_IMPLEMENTATIONS = ("auto", "asyncio", "uvloop")
+HTTP_IMPLEMENTATIONS = ("auto", "h11", "httptools")
+
+# Directory holding the generated gunicorn worker class (added to PYTHONPATH)
+TUNED_WORKER_DIR = "/etc/uvicorn"
+TUNED_WORKER_CLASS = "tuned_worker.TunedUvicornWorker"
+
+
+@dataclass(frozen=True)
+class AsgiServerSettings:
+    """Process-manager and uvicorn settings for the ASGI application.
+
+    timeout_keep_alive_seconds defaults above the ALB's 60 second idle timeout
+    (and nginx's upstream keepalive) so the proxy, not uvicorn, closes idle
+    connections and never reuses one uvicorn has just dropped.
+    """
+
+    workers: int
+    graceful_timeout_seconds: int = 30
+    max_requests: int = 0
+    loop: str = "auto"
+    http: str = "auto"
+    backlog: int = 2048
+    limit_concurrency: Optional[int] = None
+    timeout_keep_alive_seconds: int = 75
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError(f"ASGI worker count must be at least 1, got {self.workers}")
+        if self.graceful_timeout_seconds < 0 or self.max_requests < 0:
+            raise ValueError("ASGI graceful timeout and max requests must not be negative")
+        if self.loop not in LOOP_IMPLEMENTATIONS:
+            raise ValueError(f"uvicorn loop must be one of {LOOP_IMPLEMENTATIONS}, got {self.loop!r}")
+        if self.http not in HTTP_IMPLEMENTATIONS:
+            raise ValueError(f"uvicorn http must be one of {HTTP_IMPLEMENTATIONS}, got {self.http!r}")
+        if self.backlog < 1:
+            raise ValueError(f"uvicorn backlog must be at least 1, got {self.backlog}")
+        if self.limit_concurrency is not None and self.limit_concurrency < 1:
+            raise ValueError(f"uvicorn limit_concurrency must be at least 1, got {self.limit_concurrency}")
+        if self.timeout_keep_alive_seconds < 1:
+            raise ValueError(f"uvicorn keep-alive timeout must be at least 1 second, got {self.timeout_keep_alive_seconds}")
+
+    @property
+    def max_requests_jitter(self) -> int:
+        # Spread worker recycling so workers do not all restart at once
+        return self.max_requests // 10
+
+    @property
+    def needs_tuned_worker(self) -> bool:
+        # gunicorn's stock UvicornWorker hardcodes loop/http and has no concurrency limit
+        return self.loop != "auto" or self.http != "auto" or self.limit_concurrency is not None
+
+
+def render_tuned_worker(settings: AsgiServerSettings) -> str:
+    """Render a UvicornWorker subclass carrying the uvicorn options gunicorn cannot pass."""
+    config = {"loop": settings.loop, "http": settings.http}
+    if settings.limit_concurrency is not None:
+        config["limit_concurrency"] = settings.limit_concurrency
+    return f"""
+from uvicorn.workers import UvicornWorker
+
+
+class TunedUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {config!r}
+"""
+
+
+def gunicorn_command(venv: str, settings: AsgiServerSettings, bind: str) -> str:
+    """Command line running the application under gunicorn with uvicorn workers.
+
+    The listen backlog belongs to whoever creates the socket, so it is not set here.
+    """
+    worker_class = TUNED_WORKER_CLASS if settings.needs_tuned_worker else "uvicorn.workers.UvicornWorker"
+    args = [
+        f"{venv}/bin/gunicorn", APP_MODULE,
+        "--worker-class", worker_class,
+        "--workers", str(settings.workers),
+        "--bind", bind,
+        "--graceful-timeout", str(settings.graceful_timeout_seconds),
+        # UvicornWorker passes gunicorn's keep-alive through as uvicorn's timeout_keep_alive
+        "--keep-alive", str(settings.timeout_keep_alive_seconds),
+    ]
+    if settings.max_requests:
+        args += [
+            "--max-requests", str(settings.max_requests),
+            "--max-requests-jitter", str(settings.max_requests_jitter),
+        ]
+    return " ".join(args)
+
+
+def uvicorn_command(settings: AsgiServerSettings, port: int) -> List[str]:
+    """Container command running the application with uvicorn's own worker manager."""
+    args = [
+        "uvicorn", APP_MODULE,
+        "--host", "0.0.0.0",
+        "--port", str(port),
+        "--workers", str(settings.workers),
+        "--timeout-graceful-shutdown", str(settings.graceful_timeout_seconds),
+        "--loop", settings.loop,
+        "--http", settings.http,
+        "--backlog", str(settings.backlog),
+        "--timeout-keep-alive", str(settings.timeout_keep_alive_seconds),
+    ]
+    if settings.limit_concurrency is not None:
+        args += ["--limit-concurrency", str(settings.limit_concurrency)]
+    if settings.max_requests:
+        args += ["--limit-max-requests", str(settings.max_requests)]
+    return args
@@ -0,0 +1,142 @@
+import re
+from typing import List, Optional, Sequence
+
+from aws_cdk import (
+    aws_ec2 as ec2,
+    aws_ecs as ecs,
+    aws_lambda as lambda_,
+)
+
+X86_64 = ec2.InstanceArchitecture.X86_64
+ARM_64 = ec2.InstanceArchitecture.ARM_64
+
+# Performance profiles selectable per tier, keyed to the instance family they resolve to
+PERFORMANCE_PROFILE_FAMILIES = {
+    "burstable-unlimited": "t",
+    "general-purpose": "m",
+    "compute-optimized": "c",
+    "memory-optimized": "r",
+}
+
+# Instance type used when a tier does not specify one
+PROFILE_INSTANCE_TYPES = {
+    "burstable-unlimited": {X86_64: "t3.micro", ARM_64: "t4g.micro"},
+    "general-purpose": {X86_64: "m6i.large", ARM_64: "m7g.large"},
+    "compute-optimized": {X86_64: "c6i.large", ARM_64: "c7g.large"},
+    "memory-optimized": {X86_64: "r6i.large", ARM_64: "r7g.large"},
+}
+
+# Interchangeable instance types offered to the Spot scraper fleet
+PROFILE_SCRAPER_INSTANCE_TYPES = {
+    "burstable-unlimited": {
+        X86_64: ["t3.medium", "t3a.medium"],
+        ARM_64: ["t4g.medium"],
+    },
+    "general-purpose": {
+        X86_64: ["m5.large", "m5a.large", "m6i.large", "m6a.large"],
+        ARM_64: ["m6g.large", "m7g.large"],
+    },
+    "compute-optimized": {
+        X86_64: ["c5.large", "c5a.large", "c6i.large", "c6a.large"],
+        ARM_64: ["c6g.large", "c6gn.large", "c7g.large"],
+    },
+    "memory-optimized": {
+        X86_64: ["r5.large", "r5a.large", "r6i.large", "r6a.large"],
+        ARM_64: ["r6g.large", "r7g.large"],
+    },
+}
+
+# RDS has no compute-optimized classes; RDS T-class instances always run in unlimited mode
+PROFILE_DB_INSTANCE_TYPES = {
+    "burstable-unlimited": "t3.micro",
+    "general-purpose": "m6g.large",
+    "memory-optimized": "r6g.large",
+}
+
+# Amazon Linux AMI flavour matching each CPU architecture
+AMAZON_LINUX_CPU_TYPES = {
+    ec2.InstanceArchitecture.X86_64: ec2.AmazonLinuxCpuType.X86_64,
+    ec2.InstanceArchitecture.ARM_64: ec2.AmazonLinuxCpuType.ARM_64,
+}
+
+# Fargate runtime platform matching each CPU architecture
+ECS_CPU_ARCHITECTURES = {
+    ec2.InstanceArchitecture.X86_64: ecs.CpuArchitecture.X86_64,
+    ec2.InstanceArchitecture.ARM_64: ecs.CpuArchitecture.ARM64,
+}
+
+# Lambda architecture matching each CPU architecture
+LAMBDA_ARCHITECTURES = {
+    ec2.InstanceArchitecture.X86_64: lambda_.Architecture.X86_64,
+    ec2.InstanceArchitecture.ARM_64: lambda_.Architecture.ARM_64,
+}
+
+
+def _check_profile(profile: str, name: str) -> None:
+    if profile not in PERFORMANCE_PROFILE_FAMILIES:
+        raise ValueError(f"Performance profile must be one of {tuple(PERFORMANCE_PROFILE_FAMILIES)}, got {profile!r}")
+    family = re.match(r"^([a-z]+)\d", name)
+    if family is None or family.group(1) != PERFORMANCE_PROFILE_FAMILIES[profile]:
+        raise ValueError(f"Instance type {name} does not belong to the {profile} performance profile")
+
+
+def is_burstable(instance_type: ec2.InstanceType) -> bool:
+    """Return True for T-class instance types, which run on CPU credits."""
+    return instance_type.to_string().startswith("t")
+
+
+def instance_type_for(architecture: ec2.InstanceArchitecture,
+                      instance_type: Optional[str] = None,
+                      profile: str = "burstable-unlimited") -> ec2.InstanceType:
+    """Return the instance type for a tier, rejecting types that do not match the architecture or profile."""
+    name = instance_type or PROFILE_INSTANCE_TYPES.get(profile, {}).get(architecture, "")
+    _check_profile(profile, name)
+    resolved = ec2.InstanceType(name)
+    if resolved.architecture != architecture:
+        raise ValueError(
+            f"Instance type {name} is {resolved.architecture.name} but the stack "
+            f"is configured for {architecture.name} AMIs"
+        )
+    return resolved
+
+
+def scraper_instance_types_for(architecture: ec2.InstanceArchitecture,
+                               instance_types: Optional[Sequence[str]] = None,
+                               profile: str = "compute-optimized") -> List[ec2.InstanceType]:
+    """Return the validated instance types offered to the scraper fleet."""
+    names = instance_types or PROFILE_SCRAPER_INSTANCE_TYPES.get(profile, {}).get(architecture, [""])
+    return [instance_type_for(architecture, name, profile) for name in names]
+
+
+def db_instance_type_for(instance_type: Optional[str] = None,
+                         profile: str = "burstable-unlimited") -> ec2.InstanceType:
+    """Return the RDS instance type (without the "db." prefix) for a performance profile."""
+    if profile == "compute-optimized":
+        raise ValueError("RDS has no compute-optimized instance classes; use general-purpose")
+    name = instance_type or PROFILE_DB_INSTANCE_TYPES.get(profile, "")
+    _check_profile(profile, name)
+    return ec2.InstanceType(name)
+
+
+def vcpus_for(instance_type: ec2.InstanceType) -> int:
+    """Return the vCPU count of an EC2 instance type."""
+    name = instance_type.to_string()
+    instance_class, size = name.split(".", 1)
+    if size in ("nano", "micro", "small", "medium"):
+        if instance_class == "t2":
+            return 2 if size == "medium" else 1
+        return 2 if instance_class.startswith("t") else 1
+    if size == "large":
+        return 2
+    multiple = re.fullmatch(r"(\d*)xlarge", size)
+    if multiple is None:
+        raise ValueError(f"Cannot derive the vCPU count of {name}; set the worker count explicitly")
+    return 4 * int(multiple.group(1) or 1)
+
+
+def machine_image_for(architecture: ec2.InstanceArchitecture) -> ec2.IMachineImage:
+    """Return the Amazon Linux 2 image built for the given architecture."""
+    return ec2.AmazonLinuxImage(
+        generation=ec2.AmazonLinuxGeneration.AMAZON_LINUX_2,
+        cpu_type=AMAZON_LINUX_CPU_TYPES[architecture]
+    )
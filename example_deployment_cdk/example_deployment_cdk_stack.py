@@ -1,21 +1,259 @@
 from aws_cdk import (
     Stack,
+    aws_autoscaling as autoscaling,
+    aws_certificatemanager as acm,
+    aws_cloudfront as cloudfront,
+    aws_cloudfront_origins as origins,
     aws_ec2 as ec2,
+    aws_elasticloadbalancingv2 as elbv2,
     aws_iam as iam,
     aws_rds as rds,
+    aws_ssm as ssm,
     CfnOutput,
     Duration,
+    Fn,
     RemovalPolicy
 )
 from constructs import Construct
+from typing import Mapping, Optional, Sequence
+
+from .api_cdn import ApiCacheBehavior, ApiCdn, stale_while_revalidate_directives
+from .asgi_server import AsgiServerSettings, uvicorn_command
+from .compute import (
+    ECS_CPU_ARCHITECTURES,
+    LAMBDA_ARCHITECTURES,
+    db_instance_type_for,
+    instance_type_for,
+    is_burstable,
+    machine_image_for,
+    scraper_instance_types_for,
+    vcpus_for,
+)
+from .fargate_api import FargateApi
+from .monitoring import (
+    asg_cpu_credit_balance,
+    burst_balance_alarm,
+    cpu_credit_balance_alarm,
+    disk_queue_depth_alarm,
+)
+from .nginx import DEFAULT_COMPRESSIBLE_TYPES, MicroCache, NginxSettings
+from .os_tuning import kernel_profile_for
+from .postgres_tuning import STORAGE_TYPES, postgres_parameters
+from .scaling import (
+    add_predictive_request_scaling,
+    add_scheduled_actions,
+    add_scheduled_task_count_actions,
+)
+from .scraper_function import ScraperFunction
+from .scraper_workers import ScraperWorkers
+from .static_assets import StaticAssets
+from .user_data import APP_DIR, api_user_data
+
+# Compute modes for the API tier
+API_COMPUTE_MODES = ("ec2", "fargate")
+
+# Launch lifecycle hook the API user data completes once bootstrapped
+API_LAUNCH_HOOK = "api-bootstrap"
+
 
 class ExampleDeploymentCdkStack(Stack):
 
-    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 cpu_architecture: ec2.InstanceArchitecture = ec2.InstanceArchitecture.X86_64,
+                 api_compute: str = "ec2",
+                 api_container_image: Optional[str] = None,
+                 api_task_cpu: int = 512,
+                 api_task_memory_mib: int = 1024,
+                 api_target_cpu_utilization: int = 60,
+                 api_workers: Optional[int] = None,
+                 api_graceful_timeout: Duration = Duration.seconds(30),
+                 api_max_requests: int = 0,
+                 api_loop: str = "auto",
+                 api_http: str = "auto",
+                 api_backlog: int = 2048,
+                 api_limit_concurrency: Optional[int] = None,
+                 api_timeout_keep_alive: Duration = Duration.seconds(75),
+                 nginx_worker_connections: int = 4096,
+                 nginx_upstream_keepalive: int = 32,
+                 nginx_listen_backlog: Optional[int] = None,
+                 nginx_micro_cache_paths: Sequence[str] = (),
+                 nginx_micro_cache_ttl: Duration = Duration.seconds(1),
+                 nginx_micro_cache_size: str = "10m",
+                 nginx_micro_cache_max_size: str = "256m",
+                 nginx_micro_cache_key: str = "$scheme$request_method$host$request_uri",
+                 compression_min_length: int = 1024,
+                 compression_mime_types: Sequence[str] = DEFAULT_COMPRESSIBLE_TYPES,
+                 api_kernel_profile: str = "high-connection-server",
+                 scraper_kernel_profile: str = "high-outbound-client",
+                 api_performance_profile: str = "burstable-unlimited",
+                 api_instance_type: Optional[str] = None,
+                 api_min_capacity: int = 1,
+                 api_max_capacity: int = 4,
+                 api_target_requests_per_minute: int = 1000,
+                 api_warm_pool: bool = False,
+                 api_warm_pool_min_size: int = 0,
+                 api_warm_pool_max_prepared_capacity: Optional[int] = None,
+                 api_warm_pool_reuse_on_scale_in: bool = True,
+                 api_scheduled_actions: Sequence[autoscaling.BasicScheduledActionProps] = (),
+                 api_predictive_scaling: bool = False,
+                 api_predictive_scaling_mode: str = "ForecastAndScale",
+                 api_predictive_scaling_buffer: Duration = Duration.minutes(10),
+                 health_check_path: str = "/",
+                 api_elb_health_check: bool = False,
+                 scraper_performance_profile: str = "compute-optimized",
+                 scraper_instance_types: Optional[Sequence[str]] = None,
+                 scraper_min_capacity: int = 0,
+                 scraper_max_capacity: int = 10,
+                 scraper_on_demand_base_capacity: int = 0,
+                 scraper_on_demand_percentage_above_base_capacity: int = 0,
+                 scraper_backlog_per_instance: int = 100,
+                 scraper_scheduled_actions: Sequence[autoscaling.BasicScheduledActionProps] = (),
+                 scraper_worker_command: str = f"{APP_DIR}/venv/bin/python {APP_DIR}/manage.py scrape_worker",
+                 scraper_lambda: bool = False,
+                 scraper_lambda_code_path: Optional[str] = None,
+                 scraper_lambda_memory_mib: int = 512,
+                 scraper_lambda_timeout: Duration = Duration.seconds(30),
+                 scraper_lambda_reserved_concurrency: Optional[int] = 100,
+                 scraper_lambda_batch_size: int = 10,
+                 scraper_lambda_max_batching_window: Duration = Duration.seconds(5),
+                 db_performance_profile: str = "burstable-unlimited",
+                 db_instance_type: Optional[str] = None,
+                 db_storage_type: str = "gp3",
+                 db_allocated_storage: int = 100,
+                 db_iops: Optional[int] = None,
+                 db_storage_throughput: Optional[int] = None,
+                 db_max_allocated_storage: Optional[int] = None,
+                 db_disk_queue_depth_alarm_threshold: int = 10,
+                 db_burst_balance_alarm_threshold: int = 20,
+                 db_performance_insights: Optional[bool] = None,
+                 db_performance_insights_retention: rds.PerformanceInsightRetention = rds.PerformanceInsightRetention.DEFAULT,
+                 db_parameter_overrides: Optional[Mapping[str, str]] = None,
+                 db_read_replicas: int = 0,
+                 db_replica_performance_profile: Optional[str] = None,
+                 db_replica_instance_type: Optional[str] = None,
+                 db_proxy: bool = False,
+                 db_proxy_max_connections_percent: int = 90,
+                 db_proxy_borrow_timeout: Duration = Duration.seconds(120),
+                 db_proxy_idle_client_timeout: Duration = Duration.minutes(30),
+                 cpu_credit_balance_alarm_threshold: int = 20,
+                 pin_app_to_database_az: bool = False,
+                 static_assets: bool = True,
+                 api_certificate_arn: Optional[str] = None,
+                 api_domain_name: Optional[str] = None,
+                 api_cdn: bool = False,
+                 api_cdn_cache_behaviors: Sequence[ApiCacheBehavior] = (),
+                 **kwargs) -> None:
         super().__init__(scope, construct_id, **kwargs)
         
         database_name = "example_deployment_db"
 
+        if api_compute not in API_COMPUTE_MODES:
+            raise ValueError(f"api_compute must be one of {API_COMPUTE_MODES}, got {api_compute!r}")
+        if api_compute == "fargate":
+            if api_container_image is None:
+                raise ValueError("api_container_image is required when api_compute is 'fargate'")
+            if api_warm_pool or api_predictive_scaling:
+                raise ValueError("Warm pools and predictive scaling only apply when api_compute is 'ec2'")
+        if api_cdn and api_certificate_arn and api_domain_name is None:
+            raise ValueError("api_domain_name is required to put the CDN in front of an HTTPS load balancer")
+        if db_storage_type not in STORAGE_TYPES:
+            raise ValueError(f"db_storage_type must be one of {STORAGE_TYPES}, got {db_storage_type!r}")
+        if db_storage_type in ("io1", "io2") and db_iops is None:
+            raise ValueError(f"db_iops is required for {db_storage_type} storage")
+        if db_iops is not None and db_storage_type in ("gp2", "standard"):
+            raise ValueError(f"db_iops cannot be provisioned on {db_storage_type} storage")
+        if db_storage_throughput is not None and db_storage_type != "gp3":
+            raise ValueError("db_storage_throughput only applies to gp3 storage")
+        if db_storage_type == "gp3" and (db_iops or db_storage_throughput) and db_allocated_storage < 400:
+            # Below 400GiB PostgreSQL on gp3 has a fixed 3000 IOPS / 125MiBps baseline
+            raise ValueError("gp3 IOPS and throughput can only be provisioned from 400GiB of allocated storage")
+        if db_max_allocated_storage is not None and db_max_allocated_storage <= db_allocated_storage:
+            raise ValueError("db_max_allocated_storage must be greater than db_allocated_storage")
+        if db_read_replicas < 0:
+            raise ValueError(f"db_read_replicas must not be negative, got {db_read_replicas}")
+        if scraper_lambda and scraper_lambda_code_path is None:
+            # The function body (fetch, parse, store) belongs to the application
+            raise ValueError("scraper_lambda_code_path is required when scraper_lambda is enabled")
+        if not 1 <= db_proxy_max_connections_percent <= 100:
+            raise ValueError(
+                f"db_proxy_max_connections_percent must be between 1 and 100, got {db_proxy_max_connections_percent}"
+            )
+
+        # Resolve compute per tier (fails synth on an instance type/AMI/profile mismatch)
+        api_instance_type = instance_type_for(cpu_architecture, api_instance_type, api_performance_profile)
+        scraper_instance_types = scraper_instance_types_for(
+            cpu_architecture, scraper_instance_types, scraper_performance_profile
+        )
+        db_instance_type = db_instance_type_for(db_instance_type, db_performance_profile)
+        # Replicas may use another class (and profile); by default they mirror the primary
+        db_replica_instance_type = (
+            db_instance_type_for(db_replica_instance_type, db_replica_performance_profile or db_performance_profile)
+            if db_replica_instance_type or db_replica_performance_profile else db_instance_type
+        )
+        # Performance Insights defaults on outside the burstable (development) profile, per
+        # instance class, so the read workload moved to replicas shows up in top-SQL too
+        db_replica_performance_insights = db_performance_insights
+        if db_performance_insights is None:
+            db_performance_insights = not is_burstable(db_instance_type)
+            db_replica_performance_insights = not is_burstable(db_replica_instance_type)
+        machine_image = machine_image_for(cpu_architecture)
+
+        # Resolve OS tuning per tier (sysctls and open-file limits)
+        api_kernel = kernel_profile_for(api_kernel_profile)
+        scraper_kernel = kernel_profile_for(scraper_kernel_profile)
+
+        # Size the ASGI worker pool from the vCPUs of the instance (or Fargate task)
+        if api_workers is None:
+            api_workers = max(1, api_task_cpu // 1024) if api_compute == "fargate" else vcpus_for(api_instance_type)
+        asgi_server = AsgiServerSettings(
+            workers=api_workers,
+            graceful_timeout_seconds=int(api_graceful_timeout.to_seconds()),
+            max_requests=api_max_requests,
+            loop=api_loop,
+            http=api_http,
+            backlog=api_backlog,
+            limit_concurrency=api_limit_concurrency,
+            timeout_keep_alive_seconds=int(api_timeout_keep_alive.to_seconds())
+        )
+        # nginx accepts the load balancer's connections, so its accept queue gets the
+        # kernel profile's full somaxconn unless set explicitly
+        somaxconn = api_kernel.sysctls.get("net.core.somaxconn") if api_kernel else None
+        if nginx_listen_backlog is None and somaxconn is not None:
+            nginx_listen_backlog = int(somaxconn)
+
+        # The kernel silently truncates a listen backlog above somaxconn
+        for name, backlog in (("api_backlog", api_backlog), ("nginx_listen_backlog", nginx_listen_backlog)):
+            if somaxconn is not None and backlog is not None and backlog > int(somaxconn):
+                raise ValueError(
+                    f"{name} {backlog} exceeds net.core.somaxconn ({somaxconn}) "
+                    f"of kernel profile {api_kernel_profile!r}"
+                )
+
+        # Per-path nginx directives; cached API paths advertise stale-while-revalidate to the CDN
+        location_directives = {}
+        if api_cdn:
+            for behavior in api_cdn_cache_behaviors:
+                location_directives.setdefault(behavior.path_pattern, []).extend(
+                    stale_while_revalidate_directives(behavior)
+                )
+
+        nginx = NginxSettings(
+            worker_connections=nginx_worker_connections,
+            upstream_keepalive=nginx_upstream_keepalive,
+            listen_backlog=nginx_listen_backlog,
+            location_directives=location_directives,
+            # Opt-in micro-cache so a burst on one URL reaches uvicorn once per TTL
+            micro_cache=MicroCache(
+                paths=nginx_micro_cache_paths,
+                ttl_seconds=int(nginx_micro_cache_ttl.to_seconds()),
+                keys_zone_size=nginx_micro_cache_size,
+                max_size=nginx_micro_cache_max_size,
+                key=nginx_micro_cache_key
+            ) if nginx_micro_cache_paths else None,
+            gzip_min_length=compression_min_length,
+            gzip_types=tuple(compression_mime_types)
+        )
+
         # Create VPC
         vpc = ec2.Vpc(self, "DjangoScraperVPC",
             max_azs=2,
@@ -54,28 +292,125 @@ class ExampleDeploymentCdkStack(Stack):
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS)
         )
 
+        # Subnets for the app tiers; optionally pinned to the AZ of the database primary
+        # so every ORM round trip stays inside one AZ
+        app_subnets = ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS)
+        database_az = None
+        if pin_app_to_database_az:
+            database_subnet = vpc.private_subnets[0]
+            database_az = database_subnet.availability_zone
+            app_subnets = ec2.SubnetSelection(subnets=[database_subnet])
+
+        # Parameter groups sized to each instance class; the app connects without TLS using md5 passwords
+        db_engine = rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_14)
+
+        def db_parameter_group(construct_id: str, instance_type: ec2.InstanceType) -> rds.ParameterGroup:
+            return rds.ParameterGroup(self, construct_id,
+                engine=db_engine,
+                description=f"PostgreSQL settings tuned for db.{instance_type.to_string()}",
+                parameters={
+                    "rds.force_ssl": "0",
+                    "password_encryption": "md5",
+                    **postgres_parameters(instance_type, db_storage_type, db_parameter_overrides),
+                }
+            )
+
+        # Storage shared by the primary and its replicas; max_allocated_storage enables storage autoscaling
+        db_storage = dict(
+            storage_type=rds.StorageType[db_storage_type.upper()],
+            iops=db_iops,
+            storage_throughput=db_storage_throughput,
+            max_allocated_storage=db_max_allocated_storage
+        )
+
         # Create PostgreSQL instance
         db_instance = rds.DatabaseInstance(self, "PostgreSQLInstance",
-            engine=rds.DatabaseInstanceEngine.postgres(version=rds.PostgresEngineVersion.VER_14),
-            instance_type=ec2.InstanceType.of(ec2.InstanceClass.BURSTABLE3, ec2.InstanceSize.MICRO),
+            engine=db_engine,
+            instance_type=db_instance_type,
             vpc=vpc,
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
             subnet_group=rds_subnet_group,
+            availability_zone=database_az,
             security_groups=[security_group],
             database_name=database_name,
             credentials=rds.Credentials.from_generated_secret("postgres"),
             backup_retention=Duration.days(7),
             removal_policy=RemovalPolicy.DESTROY,
             publicly_accessible=False,
-            parameters={
-                "rds.force_ssl": "0",
-                "password_encryption": "md5"
-            }
+            allocated_storage=db_allocated_storage,
+            **db_storage,
+            enable_performance_insights=db_performance_insights,
+            performance_insight_retention=db_performance_insights_retention if db_performance_insights else None,
+            parameter_group=db_parameter_group("PostgreSQLParameterGroup", db_instance_type)
         )
 
+        # I/O queueing means the volume cannot keep up with the crawl's writes
+        disk_queue_depth_alarm(self, "DBDiskQueueDepthAlarm",
+            metric=db_instance.metric("DiskQueueDepth", statistic="Average", period=Duration.minutes(5)),
+            threshold=db_disk_queue_depth_alarm_threshold
+        )
+        if db_storage_type == "gp2":
+            burst_balance_alarm(self, "DBBurstBalanceAlarm",
+                metric=db_instance.metric("BurstBalance", statistic="Minimum", period=Duration.minutes(5)),
+                threshold=db_burst_balance_alarm_threshold
+            )
+
+        if is_burstable(db_instance_type):
+            cpu_credit_balance_alarm(self, "DBCpuCreditBalanceAlarm",
+                metric=db_instance.metric("CPUCreditBalance", statistic="Minimum", period=Duration.minutes(5)),
+                threshold=cpu_credit_balance_alarm_threshold
+            )
+
         # Allow EC2 instance to access the RDS instance
         db_instance.connections.allow_from(security_group, ec2.Port.tcp(5432))
 
+        # Read replicas take read-only queries (e.g. browsing scraped data) off the primary
+        db_replicas = []
+        if db_read_replicas:
+            replica_parameter_group = db_parameter_group("PostgreSQLReplicaParameterGroup", db_replica_instance_type)
+        for index in range(db_read_replicas):
+            replica = rds.DatabaseInstanceReadReplica(self, f"PostgreSQLReadReplica{index}",
+                source_database_instance=db_instance,
+                instance_type=db_replica_instance_type,
+                vpc=vpc,
+                vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+                subnet_group=rds_subnet_group,
+                security_groups=[security_group],
+                parameter_group=replica_parameter_group,
+                **db_storage,
+                enable_performance_insights=db_replica_performance_insights,
+                performance_insight_retention=(
+                    db_performance_insights_retention if db_replica_performance_insights else None
+                ),
+                removal_policy=RemovalPolicy.DESTROY,
+                publicly_accessible=False
+            )
+            if is_burstable(db_replica_instance_type):
+                cpu_credit_balance_alarm(self, f"DBReadReplica{index}CpuCreditBalanceAlarm",
+                    metric=replica.metric("CPUCreditBalance", statistic="Minimum", period=Duration.minutes(5)),
+                    threshold=cpu_credit_balance_alarm_threshold
+                )
+            db_replicas.append(replica)
+        db_reader_hosts = [replica.db_instance_endpoint_address for replica in db_replicas]
+
+        # Pool connections from every worker in the fleet through RDS Proxy, which also
+        # absorbs reconnects on secret rotation; the app tiers connect to its endpoint
+        db_host = db_instance.db_instance_endpoint_address
+        if db_proxy:
+            proxy = db_instance.add_proxy("PostgreSQLProxy",
+                secrets=[db_instance.secret],
+                vpc=vpc,
+                vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+                security_groups=[security_group],
+                max_connections_percent=db_proxy_max_connections_percent,
+                borrow_timeout=db_proxy_borrow_timeout,
+                idle_client_timeout=db_proxy_idle_client_timeout,
+                # Match the instance: plaintext connections with md5 passwords
+                require_tls=False,
+                client_password_auth_type=rds.ClientPasswordAuthType.POSTGRES_MD5
+            )
+            db_host = proxy.endpoint
+
         # Create IAM Role for EC2
         role = iam.Role(self, "DjangoScraperEC2Role",
             assumed_by=iam.ServicePrincipal("ec2.amazonaws.com")
@@ -109,60 +444,290 @@ class ExampleDeploymentCdkStack(Stack):
             key_name="django-scraper-key"
         )
 
-        # Create EC2 Instance
-        instance = ec2.Instance(self, "DjangoScraperInstance",
-            instance_type=ec2.InstanceType("t3.micro"),
-            machine_image=ec2.AmazonLinuxImage(generation=ec2.AmazonLinuxGeneration.AMAZON_LINUX_2),
+        # Connection settings handed to the containerised API tier
+        api_environment = {
+            "DB_HOST": db_host,
+            "DB_PORT": db_instance.db_instance_endpoint_port,
+            "DB_NAME": database_name,
+        }
+        if db_replicas:
+            api_environment["DB_READER_HOSTS"] = Fn.join(",", db_reader_hosts)
+
+        # Create S3 bucket and CDN for Django static/media files so uvicorn never serves them
+        if static_assets:
+            assets = StaticAssets(self, "StaticAssets")
+
+            # Allow the EC2 instances to upload files during collectstatic
+            assets.bucket.grant_read_write(role)
+
+            api_environment["STATIC_BUCKET_NAME"] = assets.bucket.bucket_name
+            api_environment["STATIC_URL"] = f"https://{assets.distribution.distribution_domain_name}/static/"
+
+        # Create Application Load Balancer in front of the API tier
+        alb = elbv2.ApplicationLoadBalancer(self, "DjangoScraperALB",
             vpc=vpc,
+            internet_facing=True,
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PUBLIC),
+            http2_enabled=True
+        )
+
+        # Terminate TLS (and HTTP/2) at the load balancer when a certificate or domain is given
+        certificate = None
+        if api_certificate_arn:
+            certificate = elbv2.ListenerCertificate.from_arn(api_certificate_arn)
+        elif api_domain_name:
+            # DNS validation records must be created in the domain's zone before the stack completes
+            certificate = elbv2.ListenerCertificate.from_certificate_manager(
+                acm.Certificate(self, "ApiCertificate",
+                    domain_name=api_domain_name,
+                    validation=acm.CertificateValidation.from_dns()
+                )
+            )
+
+        if certificate:
+            listener = alb.add_listener("HttpsListener",
+                port=443,
+                certificates=[certificate],
+                ssl_policy=elbv2.SslPolicy.RECOMMENDED_TLS,
+                open=True
+            )
+
+            # Redirect plain HTTP to HTTPS
+            alb.add_redirect(
+                source_protocol=elbv2.ApplicationProtocol.HTTP,
+                source_port=80,
+                target_protocol=elbv2.ApplicationProtocol.HTTPS,
+                target_port=443
+            )
+        else:
+            listener = alb.add_listener("HttpListener", port=80, open=True)
+
+        if api_compute == "fargate":
+            # Run the ASGI application as a Fargate service instead of EC2 instances
+            fargate_api = FargateApi(self, "FargateApi",
+                vpc=vpc,
+                vpc_subnets=app_subnets,
+                security_group=security_group,
+                listener=listener,
+                container_image=api_container_image,
+                cpu_architecture=ECS_CPU_ARCHITECTURES[cpu_architecture],
+                command=uvicorn_command(asgi_server, 8000),
+                environment=api_environment,
+                db_secret=db_instance.secret,
+                health_check_path=health_check_path,
+                cpu=api_task_cpu,
+                memory_limit_mib=api_task_memory_mib,
+                min_capacity=api_min_capacity,
+                max_capacity=api_max_capacity,
+                target_cpu_utilization=api_target_cpu_utilization,
+                target_requests_per_minute=api_target_requests_per_minute,
+                nofile=api_kernel.nofile if api_kernel else None,
+                system_controls=api_kernel.namespaced_sysctls() if api_kernel else None
+            )
+
+            if static_assets:
+                assets.bucket.grant_read_write(fargate_api.task_definition.task_role)
+
+            # Put API capacity in place ahead of known traffic (crawl landings, daily peaks)
+            add_scheduled_task_count_actions(fargate_api.scaling, api_scheduled_actions)
+        else:
+            # Create Launch Template for the API instances
+            launch_template = ec2.LaunchTemplate(self, "DjangoScraperLaunchTemplate",
+                instance_type=api_instance_type,
+                machine_image=machine_image,
+                security_group=security_group,
+                role=role,
+                key_name=key_pair.key_name,
+                # Set the credit specification explicitly so T-class instances never throttle to baseline
+                cpu_credits=ec2.CpuCredits.UNLIMITED if is_burstable(api_instance_type) else None,
+                user_data=api_user_data(asgi_server, nginx, api_kernel,
+                    lifecycle_hook_name=API_LAUNCH_HOOK if api_warm_pool else None
+                )
+            )
+
+            # Create Auto Scaling Group for the API tier
+            asg = autoscaling.AutoScalingGroup(self, "DjangoScraperASG",
+                vpc=vpc,
+                vpc_subnets=app_subnets,
+                launch_template=launch_template,
+                min_capacity=api_min_capacity,
+                max_capacity=api_max_capacity,
+                # The user data does not deploy the app, so instances would fail ALB health
+                # checks until it is deployed; only opt into ELB checks once images ship the app
+                health_check=(
+                    autoscaling.HealthCheck.elb(grace=Duration.minutes(5)) if api_elb_health_check
+                    else autoscaling.HealthCheck.ec2(grace=Duration.minutes(5))
+                )
+            )
+
+            # Keep stopped, already-bootstrapped instances ready for scale-out. The launch
+            # hook holds each instance until its user data reports the bootstrap finished,
+            # so Auto Scaling never stops one halfway through
+            if api_warm_pool:
+                asg.add_lifecycle_hook("BootstrapHook",
+                    lifecycle_hook_name=API_LAUNCH_HOOK,
+                    lifecycle_transition=autoscaling.LifecycleTransition.INSTANCE_LAUNCHING,
+                    default_result=autoscaling.DefaultResult.ABANDON,
+                    heartbeat_timeout=Duration.minutes(20)
+                )
+                role.add_to_policy(iam.PolicyStatement(
+                    actions=["autoscaling:CompleteLifecycleAction", "autoscaling:DescribeAutoScalingInstances"],
+                    resources=["*"]
+                ))
+                asg.add_warm_pool(
+                    min_size=api_warm_pool_min_size,
+                    max_group_prepared_capacity=api_warm_pool_max_prepared_capacity,
+                    reuse_on_scale_in=api_warm_pool_reuse_on_scale_in,
+                    pool_state=autoscaling.PoolState.STOPPED
+                )
+
+            if is_burstable(api_instance_type):
+                cpu_credit_balance_alarm(self, "ApiCpuCreditBalanceAlarm",
+                    metric=asg_cpu_credit_balance(asg),
+                    threshold=cpu_credit_balance_alarm_threshold
+                )
+
+            # Register the API instances with the load balancer (also allows ALB -> nginx traffic)
+            target_group = listener.add_targets("ApiTargets",
+                port=80,
+                protocol=elbv2.ApplicationProtocol.HTTP,
+                targets=[asg],
+                deregistration_delay=Duration.seconds(30),
+                health_check=elbv2.HealthCheck(
+                    path=health_check_path,
+                    healthy_http_codes="200-399"
+                )
+            )
+
+            # Scale the API tier on requests per instance
+            asg.scale_on_request_count("RequestCountScaling",
+                target_requests_per_minute=api_target_requests_per_minute
+            )
+
+            # Put API capacity in place ahead of known traffic (crawl landings, daily peaks)
+            add_scheduled_actions(asg, api_scheduled_actions)
+
+            if api_predictive_scaling:
+                add_predictive_request_scaling(self, "ApiPredictiveScaling",
+                    asg=asg,
+                    resource_label=f"{alb.load_balancer_full_name}/{target_group.target_group_full_name}",
+                    target_requests_per_minute=api_target_requests_per_minute,
+                    mode=api_predictive_scaling_mode,
+                    scheduling_buffer=api_predictive_scaling_buffer
+                )
+
+        # Create CloudFront front door so repeat API reads are served from the edge
+        if api_cdn:
+            cdn = ApiCdn(self, "ApiCdn",
+                # Behind HTTPS the origin must be addressed by the certificate's domain name
+                origin=origins.HttpOrigin(api_domain_name,
+                    protocol_policy=cloudfront.OriginProtocolPolicy.HTTPS_ONLY
+                ) if certificate else origins.LoadBalancerV2Origin(alb,
+                    protocol_policy=cloudfront.OriginProtocolPolicy.HTTP_ONLY
+                ),
+                behaviors=api_cdn_cache_behaviors
+            )
+
+        # Create scraper job queue and the Spot-backed worker fleet draining it
+        scraper_workers = ScraperWorkers(self, "ScraperWorkers",
+            vpc=vpc,
             security_group=security_group,
             role=role,
+            machine_image=machine_image,
+            instance_types=scraper_instance_types,
+            worker_command=scraper_worker_command,
+            vpc_subnets=app_subnets,
             key_name=key_pair.key_name,
-            user_data=ec2.UserData.custom('''
-                #!/bin/bash
-                yum update -y
-                amazon-linux-extras enable postgresql14
-                yum install -y postgresql
-                yum install -y python3 python3-pip git
-                amazon-linux-extras install -y nginx1
-                
-
-                # Update libpq
-                #yum install -y https://download.postgresql.org/pub/repos/yum/reporpms/EL-7-x86_64/pgdg-redhat-repo-latest.noarch.rpm
-                #yum install -y postgresql14-libs
-
-                # Create uvicorn.service file
-                cat << EOF > /etc/systemd/system/uvicorn.service
-                [Unit]
-                Description=uvicorn daemon
-                After=network.target
-
-                [Service]
-                User=ec2-user
-                Group=ec2-user
-                WorkingDirectory=/home/ec2-user/app
-                Environment="PYTHONPATH=/home/ec2-user/app"
-                ExecStart=/home/ec2-user/app/venv/bin/uvicorn api_project.asgi:application --host 0.0.0.0 --port 8000
-
-                [Install]
-                WantedBy=multi-user.target
-                EOF
-
-                # Reload systemd to recognize the new service
-                systemctl daemon-reload
-
-                # Enable the service to start on boot
-                systemctl enable uvicorn.service
-            ''')
-        )
-
-        # Output the database endpoint
-        CfnOutput(self, "DBEndpoint", value=db_instance.db_instance_endpoint_address)
+            cpu_credits=ec2.CpuCredits.UNLIMITED if is_burstable(scraper_instance_types[0]) else None,
+            kernel_profile=scraper_kernel,
+            min_capacity=scraper_min_capacity,
+            max_capacity=scraper_max_capacity,
+            on_demand_base_capacity=scraper_on_demand_base_capacity,
+            on_demand_percentage_above_base_capacity=scraper_on_demand_percentage_above_base_capacity,
+            backlog_per_instance=scraper_backlog_per_instance
+        )
+
+        # Pre-scale the scraper fleet for fixed crawl windows
+        add_scheduled_actions(scraper_workers.auto_scaling_group, scraper_scheduled_actions)
+
+        if is_burstable(scraper_instance_types[0]):
+            cpu_credit_balance_alarm(self, "ScraperCpuCreditBalanceAlarm",
+                metric=asg_cpu_credit_balance(scraper_workers.auto_scaling_group),
+                threshold=cpu_credit_balance_alarm_threshold
+            )
+
+        # Create Lambda fan-out for single-page scrapes that do not need a long-lived worker
+        if scraper_lambda:
+            scraper_function = ScraperFunction(self, "ScraperFunction",
+                vpc=vpc,
+                security_group=security_group,
+                code_path=scraper_lambda_code_path,
+                architecture=LAMBDA_ARCHITECTURES[cpu_architecture],
+                memory_size=scraper_lambda_memory_mib,
+                timeout=scraper_lambda_timeout,
+                reserved_concurrent_executions=scraper_lambda_reserved_concurrency,
+                batch_size=scraper_lambda_batch_size,
+                max_batching_window=scraper_lambda_max_batching_window,
+                environment={
+                    "DB_HOST": db_host,
+                    "DB_PORT": db_instance.db_instance_endpoint_port,
+                    "DB_NAME": database_name,
+                    "DB_SECRET_NAME": db_instance.secret.secret_name,
+                }
+            )
+
+            db_instance.secret.grant_read(scraper_function.function)
+
+        # Output the database endpoint the app should use (the proxy when enabled)
+        CfnOutput(self, "DBEndpoint", value=db_host)
+        if db_proxy:
+            CfnOutput(self, "DBInstanceEndpoint", value=db_instance.db_instance_endpoint_address)
         CfnOutput(self, "DBPort", value=db_instance.db_instance_endpoint_port)
         CfnOutput(self, "DBName", value=database_name)
         CfnOutput(self, "DBSecretName", value=db_instance.secret.secret_name)
+        if db_performance_insights:
+            # Performance Insights identifies the instance by its DbiResourceId
+            CfnOutput(self, "DBPerformanceInsightsResourceId",
+                value=db_instance.node.default_child.attr_dbi_resource_id
+            )
+
+        # Output the reader endpoints and publish them for the app's read-only DB router
+        if db_replicas:
+            for index, host in enumerate(db_reader_hosts):
+                CfnOutput(self, f"DBReaderEndpoint{index}", value=host)
+                if db_replica_performance_insights:
+                    CfnOutput(self, f"DBReader{index}PerformanceInsightsResourceId",
+                        value=db_replicas[index].node.default_child.attr_dbi_resource_id
+                    )
+            CfnOutput(self, "DBReaderEndpoints", value=Fn.join(",", db_reader_hosts))
+            reader_parameter = ssm.StringListParameter(self, "DBReaderEndpointsParameter",
+                parameter_name=f"/{self.stack_name}/db/reader-endpoints",
+                string_list_value=db_reader_hosts,
+                description="Read replica endpoints for read-only database queries"
+            )
+            CfnOutput(self, "DBReaderEndpointsParameterName", value=reader_parameter.parameter_name)
+
+        if pin_app_to_database_az:
+            CfnOutput(self, "AppAvailabilityZone", value=database_az)
+
+        # Output the static/media bucket and the CDN domain for STATIC_URL
+        if static_assets:
+            CfnOutput(self, "StaticBucketName", value=assets.bucket.bucket_name)
+            CfnOutput(self, "StaticCdnDomain", value=assets.distribution.distribution_domain_name)
         
 
-        # Output the instance ID and public IP
-        CfnOutput(self, "InstanceId", value=instance.instance_id)
-        CfnOutput(self, "PublicIP", value=instance.instance_public_ip)
\ No newline at end of file
+        # Output the load balancer DNS name and the API tier it fronts
+        CfnOutput(self, "LoadBalancerDNS", value=alb.load_balancer_dns_name)
+        if api_cdn:
+            CfnOutput(self, "ApiCdnDomain", value=cdn.distribution.distribution_domain_name)
+        if api_compute == "fargate":
+            CfnOutput(self, "ApiServiceName", value=fargate_api.service.service_name)
+        else:
+            CfnOutput(self, "AutoScalingGroupName", value=asg.auto_scaling_group_name)
+        CfnOutput(self, "ScraperAutoScalingGroupName", value=scraper_workers.auto_scaling_group.auto_scaling_group_name)
+        CfnOutput(self, "ScraperQueueUrl", value=scraper_workers.job_queue.queue_url)
+        CfnOutput(self, "ScraperDeadLetterQueueUrl", value=scraper_workers.dead_letter_queue.queue_url)
+
+        if scraper_lambda:
+            CfnOutput(self, "ScraperFunctionName", value=scraper_function.function.function_name)
+            CfnOutput(self, "ScraperFunctionQueueUrl", value=scraper_function.job_queue.queue_url)
\ No newline at end of file
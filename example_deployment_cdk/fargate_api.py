@@ -0,0 +1,106 @@
+from typing import Mapping, Optional, Sequence
+
+from aws_cdk import (
+    aws_ec2 as ec2,
+    aws_ecs as ecs,
+    aws_elasticloadbalancingv2 as elbv2,
+    aws_secretsmanager as secretsmanager,
+    Duration,
+)
+from constructs import Construct
+
+
+class FargateApi(Construct):
+    """ASGI application running as an autoscaled Fargate service behind the ALB listener."""
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 vpc: ec2.IVpc,
+                 vpc_subnets: ec2.SubnetSelection,
+                 security_group: ec2.ISecurityGroup,
+                 listener: elbv2.ApplicationListener,
+                 container_image: str,
+                 cpu_architecture: ecs.CpuArchitecture,
+                 command: Sequence[str],
+                 environment: Mapping[str, str],
+                 db_secret: secretsmanager.ISecret,
+                 health_check_path: str,
+                 cpu: int = 512,
+                 memory_limit_mib: int = 1024,
+                 min_capacity: int = 1,
+                 max_capacity: int = 4,
+                 target_cpu_utilization: int = 60,
+                 target_requests_per_minute: int = 1000,
+                 nofile: Optional[int] = None,
+                 system_controls: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__(scope, construct_id)
+
+        # Create ECS Cluster
+        cluster = ecs.Cluster(self, "Cluster",
+            vpc=vpc,
+            container_insights=True
+        )
+
+        # Create Task Definition running the ASGI application
+        self.task_definition = ecs.FargateTaskDefinition(self, "TaskDefinition",
+            cpu=cpu,
+            memory_limit_mib=memory_limit_mib,
+            runtime_platform=ecs.RuntimePlatform(
+                cpu_architecture=cpu_architecture,
+                operating_system_family=ecs.OperatingSystemFamily.LINUX
+            )
+        )
+
+        self.task_definition.add_container("api",
+            image=ecs.ContainerImage.from_registry(container_image),
+            command=list(command),
+            environment=dict(environment),
+            secrets={
+                "DB_USER": ecs.Secret.from_secrets_manager(db_secret, "username"),
+                "DB_PASSWORD": ecs.Secret.from_secrets_manager(db_secret, "password"),
+            },
+            port_mappings=[ecs.PortMapping(container_port=8000)],
+            ulimits=[ecs.Ulimit(name=ecs.UlimitName.NOFILE, soft_limit=nofile, hard_limit=nofile)] if nofile else None,
+            system_controls=[
+                ecs.SystemControl(namespace=namespace, value=value)
+                for namespace, value in (system_controls or {}).items()
+            ],
+            logging=ecs.LogDrivers.aws_logs(stream_prefix="api")
+        )
+
+        # Create Fargate Service; keep full capacity during deployments and roll back on failure.
+        # desired_count is left to auto scaling so a deploy never resets the running task count
+        self.service = ecs.FargateService(self, "Service",
+            cluster=cluster,
+            task_definition=self.task_definition,
+            security_groups=[security_group],
+            vpc_subnets=vpc_subnets,
+            min_healthy_percent=100,
+            circuit_breaker=ecs.DeploymentCircuitBreaker(rollback=True)
+        )
+
+        # Register the tasks with the load balancer (also allows ALB -> task traffic)
+        self.target_group = listener.add_targets("ApiTargets",
+            port=8000,
+            protocol=elbv2.ApplicationProtocol.HTTP,
+            targets=[self.service],
+            deregistration_delay=Duration.seconds(30),
+            health_check=elbv2.HealthCheck(
+                path=health_check_path,
+                healthy_http_codes="200-399"
+            )
+        )
+
+        # Scale the task count on CPU and on requests per task
+        self.scaling = self.service.auto_scale_task_count(
+            min_capacity=min_capacity,
+            max_capacity=max_capacity
+        )
+
+        self.scaling.scale_on_cpu_utilization("CpuScaling",
+            target_utilization_percent=target_cpu_utilization
+        )
+
+        self.scaling.scale_on_request_count("RequestCountScaling",
+            requests_per_target=target_requests_per_minute,
+            target_group=self.target_group
+        )
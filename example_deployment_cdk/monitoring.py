@@ -0,0 +1,59 @@
+from aws_cdk import (
+    aws_autoscaling as autoscaling,
+    aws_cloudwatch as cloudwatch,
+    Duration,
+)
+from constructs import Construct
+
+
+def asg_cpu_credit_balance(asg: autoscaling.IAutoScalingGroup) -> cloudwatch.Metric:
+    """Lowest CPUCreditBalance across the instances of an Auto Scaling Group."""
+    return cloudwatch.Metric(
+        namespace="AWS/EC2",
+        metric_name="CPUCreditBalance",
+        dimensions_map={"AutoScalingGroupName": asg.auto_scaling_group_name},
+        statistic="Minimum",
+        period=Duration.minutes(5)
+    )
+
+
+def cpu_credit_balance_alarm(scope: Construct, construct_id: str, *,
+                             metric: cloudwatch.IMetric,
+                             threshold: int) -> cloudwatch.Alarm:
+    """Alarm when a burstable instance is close to exhausting its CPU credits."""
+    return cloudwatch.Alarm(scope, construct_id,
+        metric=metric,
+        threshold=threshold,
+        evaluation_periods=3,
+        comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
+        treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        alarm_description="CPU credit balance is low; the instance is about to burst beyond its baseline"
+    )
+
+
+def disk_queue_depth_alarm(scope: Construct, construct_id: str, *,
+                           metric: cloudwatch.IMetric,
+                           threshold: int) -> cloudwatch.Alarm:
+    """Alarm when I/O requests queue up waiting for a database volume."""
+    return cloudwatch.Alarm(scope, construct_id,
+        metric=metric,
+        threshold=threshold,
+        evaluation_periods=3,
+        comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+        treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        alarm_description="Disk queue depth is high; the volume's IOPS or throughput is saturated"
+    )
+
+
+def burst_balance_alarm(scope: Construct, construct_id: str, *,
+                        metric: cloudwatch.IMetric,
+                        threshold: int) -> cloudwatch.Alarm:
+    """Alarm when a gp2 volume is close to exhausting its I/O burst credits."""
+    return cloudwatch.Alarm(scope, construct_id,
+        metric=metric,
+        threshold=threshold,
+        evaluation_periods=3,
+        comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
+        treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        alarm_description="EBS burst balance is low; the volume is about to drop to its baseline IOPS"
+    )
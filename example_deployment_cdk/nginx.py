@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence
+
+# Unix domain socket held open by systemd (uvicorn.socket), served by gunicorn, used by nginx
+UVICORN_SOCKET = "/run/uvicorn.sock"
+
+# Response types compressed by nginx; text/html is always compressed once gzip is on
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/css",
+    "text/csv",
+    "text/plain",
+    "text/xml",
+)
+
+# Directives every proxied location shares
+PROXY_DIRECTIVES = [
+    "proxy_pass http://uvicorn;",
+    "proxy_http_version 1.1;",
+    'proxy_set_header Connection "";',
+    "proxy_set_header Host $host;",
+    "proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;",
+    "proxy_set_header X-Forwarded-Proto $http_x_forwarded_proto;",
+    "proxy_redirect off;",
+    "proxy_buffering on;",
+    "proxy_buffer_size 16k;",
+    "proxy_buffers 32 16k;",
+    "proxy_busy_buffers_size 64k;",
+]
+
+
+@dataclass(frozen=True)
+class MicroCache:
+    """Short-lived nginx proxy cache for hot GET endpoints.
+
+    proxy_cache_lock collapses concurrent misses on one URL into a single
+    upstream request and use_stale updating serves the previous copy while it
+    is refreshed, so a burst of identical requests reaches uvicorn once per TTL.
+    Responses the app marks uncacheable (Cache-Control: private/no-cache,
+    Set-Cookie) are never cached, and requests carrying credentials (an
+    Authorization header or a Django session cookie) always go to uvicorn.
+    """
+
+    paths: Sequence[str]
+    ttl_seconds: int = 1
+    keys_zone_size: str = "10m"
+    max_size: str = "256m"
+    key: str = "$scheme$request_method$host$request_uri"
+
+    def __post_init__(self):
+        if not self.paths:
+            raise ValueError("nginx micro-cache needs at least one path pattern")
+        if self.ttl_seconds < 1:
+            raise ValueError(f"nginx micro-cache TTL must be at least 1 second, got {self.ttl_seconds}")
+
+    def directives(self) -> List[str]:
+        return [
+            "proxy_cache microcache;",
+            f'proxy_cache_key "{self.key}";',
+            "proxy_cache_methods GET HEAD;",
+            # Never serve or store per-user responses, whatever headers the app sets
+            "proxy_cache_bypass $http_authorization $cookie_sessionid;",
+            "proxy_no_cache $http_authorization $cookie_sessionid;",
+            f"proxy_cache_valid 200 {self.ttl_seconds}s;",
+            "proxy_cache_lock on;",
+            "proxy_cache_lock_timeout 5s;",
+            "proxy_cache_use_stale updating error timeout http_500 http_502 http_503 http_504;",
+            "proxy_cache_background_update on;",
+            "add_header X-Cache-Status $upstream_cache_status;",
+        ]
+
+
+@dataclass(frozen=True)
+class NginxSettings:
+    """Settings for the nginx reverse proxy in front of uvicorn.
+
+    location_directives maps CloudFront-style path patterns ("/api/results/*" or
+    an exact "/api/status") to extra directives for that location. listen_backlog
+    sizes the accept queue of port 80; nginx uses 511 when it is not set.
+    """
+
+    worker_connections: int = 4096
+    upstream_keepalive: int = 32
+    client_max_body_size: str = "10m"
+    location_directives: Mapping[str, Sequence[str]] = field(default_factory=dict)
+    micro_cache: Optional[MicroCache] = None
+    gzip_min_length: int = 1024
+    gzip_types: Sequence[str] = DEFAULT_COMPRESSIBLE_TYPES
+    gzip_comp_level: int = 5
+    listen_backlog: Optional[int] = None
+
+    def __post_init__(self):
+        if self.worker_connections < 1 or self.upstream_keepalive < 1:
+            raise ValueError("nginx worker_connections and upstream keepalive must be at least 1")
+        if self.listen_backlog is not None and self.listen_backlog < 1:
+            raise ValueError(f"nginx listen backlog must be at least 1, got {self.listen_backlog}")
+        if self.gzip_min_length < 0 or not 1 <= self.gzip_comp_level <= 9:
+            raise ValueError("nginx gzip_min_length must not be negative and gzip_comp_level must be 1-9")
+
+
+def nginx_location(path_pattern: str) -> str:
+    """Translate a CloudFront path pattern into an nginx location match."""
+    if path_pattern.endswith("*"):
+        return f"^~ {path_pattern[:-1]}"
+    return f"= {path_pattern}"
+
+
+def _location_block(match: str, extra_directives: Sequence[str]) -> str:
+    directives = "\n".join(f"            {directive}" for directive in [*PROXY_DIRECTIVES, *extra_directives])
+    return f"        location {match} {{\n{directives}\n        }}"
+
+
+def render_nginx_conf(settings: NginxSettings) -> str:
+    """Render /etc/nginx/nginx.conf proxying port 80 to uvicorn over a Unix socket.
+
+    Responses are buffered by nginx so slow clients never hold a uvicorn worker,
+    and upstream connections are kept alive instead of reopened per request.
+    """
+    location_directives: Dict[str, List[str]] = {
+        path_pattern: list(directives) for path_pattern, directives in settings.location_directives.items()
+    }
+    # Compress here so the Python workers never spend CPU on it
+    gzip_types = " ".join(mime_type for mime_type in settings.gzip_types if mime_type != "text/html")
+    http_directives: List[str] = [
+        "gzip on;",
+        "gzip_vary on;",
+        "gzip_proxied any;",
+        f"gzip_comp_level {settings.gzip_comp_level};",
+        f"gzip_min_length {settings.gzip_min_length};",
+    ]
+    if gzip_types:
+        http_directives.append(f"gzip_types {gzip_types};")
+    if settings.micro_cache:
+        http_directives.append(
+            "proxy_cache_path /var/cache/nginx/microcache levels=1:2 "
+            f"keys_zone=microcache:{settings.micro_cache.keys_zone_size} "
+            f"max_size={settings.micro_cache.max_size} inactive=10m use_temp_path=off;"
+        )
+        for path_pattern in settings.micro_cache.paths:
+            location_directives.setdefault(path_pattern, []).extend(settings.micro_cache.directives())
+
+    locations = [
+        _location_block(nginx_location(path_pattern), directives)
+        for path_pattern, directives in location_directives.items()
+    ]
+    locations.append(_location_block("/", []))
+    locations = "\n\n".join(locations)
+    http_directives = "".join(f"\n    {directive}" for directive in http_directives)
+    listen = "80 default_server"
+    if settings.listen_backlog is not None:
+        listen += f" backlog={settings.listen_backlog}"
+
+    return f"""
+user nginx;
+worker_processes auto;
+worker_rlimit_nofile {settings.worker_connections * 2};
+error_log /var/log/nginx/error.log;
+pid /run/nginx.pid;
+
+include /usr/share/nginx/modules/*.conf;
+
+events {{
+    worker_connections {settings.worker_connections};
+    multi_accept on;
+}}
+
+http {{
+    include /etc/nginx/mime.types;
+    default_type application/octet-stream;
+    access_log /var/log/nginx/access.log;
+    sendfile on;
+    tcp_nopush on;
+    keepalive_timeout 65;{http_directives}
+
+    upstream uvicorn {{
+        server unix:{UVICORN_SOCKET} fail_timeout=0;
+        keepalive {settings.upstream_keepalive};
+    }}
+
+    server {{
+        listen {listen};
+        server_name _;
+        client_max_body_size {settings.client_max_body_size};
+
+{locations}
+    }}
+}}
+"""
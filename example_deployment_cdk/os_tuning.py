@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+# Kernel parameters that are per network namespace and can be set on a Fargate task
+NAMESPACED_SYSCTL_PREFIXES = ("net.ipv4.", "net.core.somaxconn")
+
+SYSCTL_CONF = "/etc/sysctl.d/90-example-deployment.conf"
+LIMITS_CONF = "/etc/security/limits.d/90-example-deployment.conf"
+
+
+@dataclass(frozen=True)
+class KernelProfile:
+    """sysctl values and open-file limit applied to a host and its service units."""
+
+    sysctls: Mapping[str, str] = field(default_factory=dict)
+    nofile: int = 65535
+
+    def namespaced_sysctls(self) -> Dict[str, str]:
+        return {key: value for key, value in self.sysctls.items() if key.startswith(NAMESPACED_SYSCTL_PREFIXES)}
+
+
+KERNEL_PROFILES: Dict[str, Optional[KernelProfile]] = {
+    # Leave the Amazon Linux defaults untouched
+    "default": None,
+    # API hosts: deep accept queues for nginx/gunicorn and many client connections
+    "high-connection-server": KernelProfile(
+        sysctls={
+            "net.core.somaxconn": "4096",
+            "net.ipv4.tcp_max_syn_backlog": "8192",
+            "net.core.netdev_max_backlog": "16384",
+            "net.ipv4.ip_local_port_range": "1024 65535",
+            "net.ipv4.tcp_tw_reuse": "1",
+            "fs.file-max": "2097152",
+        },
+        nofile=65535
+    ),
+    # Scraper hosts: thousands of concurrent outbound sockets
+    "high-outbound-client": KernelProfile(
+        sysctls={
+            "net.core.somaxconn": "1024",
+            "net.ipv4.ip_local_port_range": "1024 65535",
+            "net.ipv4.tcp_tw_reuse": "1",
+            "net.ipv4.tcp_fin_timeout": "15",
+            "fs.file-max": "2097152",
+        },
+        nofile=262144
+    ),
+}
+
+
+def kernel_profile_for(name: str) -> Optional[KernelProfile]:
+    """Return the named kernel profile (None for "default")."""
+    if name not in KERNEL_PROFILES:
+        raise ValueError(f"Kernel profile must be one of {tuple(KERNEL_PROFILES)}, got {name!r}")
+    return KERNEL_PROFILES[name]
+
+
+def render_sysctl_conf(profile: KernelProfile) -> str:
+    return "\n".join(f"{key} = {value}" for key, value in profile.sysctls.items())
+
+
+def render_limits_conf(profile: KernelProfile) -> str:
+    return "\n".join([
+        f"* soft nofile {profile.nofile}",
+        f"* hard nofile {profile.nofile}",
+    ])
@@ -0,0 +1,72 @@
+import re
+from typing import Dict, Mapping, Optional
+
+from aws_cdk import aws_ec2 as ec2
+
+from .compute import vcpus_for
+
+# Memory of burstable classes by size; M and R classes scale with their vCPUs
+BURSTABLE_MEMORY_GIB = {
+    "micro": 1,
+    "small": 2,
+    "medium": 4,
+    "large": 8,
+    "xlarge": 16,
+    "2xlarge": 32,
+}
+MEMORY_GIB_PER_VCPU = {"m": 4, "r": 8}
+
+# Storage types backed by SSDs (random reads cost about the same as sequential ones)
+SSD_STORAGE_TYPES = ("gp2", "gp3", "io1", "io2")
+STORAGE_TYPES = (*SSD_STORAGE_TYPES, "standard")
+
+# Per-statement statistics (top SQL by time, calls and I/O) for tuning the ORM's queries
+PG_STAT_STATEMENTS_PARAMETERS = {
+    "shared_preload_libraries": "pg_stat_statements",
+    "pg_stat_statements.track": "top",
+    "pg_stat_statements.max": "10000",
+    "pg_stat_statements.track_utility": "0",
+    "track_io_timing": "1",
+}
+
+
+def memory_gib_for(instance_type: ec2.InstanceType) -> int:
+    """Return the memory of an RDS instance class (without the "db." prefix)."""
+    name = instance_type.to_string()
+    instance_class, size = name.split(".", 1)
+    family = re.match(r"^([a-z]+)\d", instance_class)
+    if family is not None and family.group(1) == "t" and size in BURSTABLE_MEMORY_GIB:
+        return BURSTABLE_MEMORY_GIB[size]
+    if family is not None and family.group(1) in MEMORY_GIB_PER_VCPU:
+        return vcpus_for(instance_type) * MEMORY_GIB_PER_VCPU[family.group(1)]
+    raise ValueError(f"Cannot derive the memory of db.{name}; set the tuned parameters as overrides")
+
+
+def postgres_parameters(instance_type: ec2.InstanceType, storage_type: str = "gp2",
+                        overrides: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """Return PostgreSQL memory, planner and WAL settings sized for an instance class and storage type.
+
+    Values are in the units RDS expects (shared_buffers and effective_cache_size in
+    8kB pages, work_mem and maintenance_work_mem in kB, max_wal_size in MB).
+    pg_stat_statements is always preloaded. Overrides replace or extend the
+    computed values key by key.
+    """
+    if storage_type not in STORAGE_TYPES:
+        raise ValueError(f"Storage type must be one of {STORAGE_TYPES}, got {storage_type!r}")
+    memory_kib = memory_gib_for(instance_type) * 1024 * 1024
+    ssd = storage_type in SSD_STORAGE_TYPES
+    parameters = {
+        # A quarter of memory for PostgreSQL's cache, the OS page cache holds most of the rest
+        "shared_buffers": str(memory_kib // 4 // 8),
+        "effective_cache_size": str(memory_kib * 3 // 4 // 8),
+        # Per sort/hash node, so kept small: 4MB on 1GiB up to 64MB from 16GiB
+        "work_mem": str(min(max(memory_kib // 256, 4 * 1024), 64 * 1024)),
+        "maintenance_work_mem": str(min(memory_kib // 16, 2 * 1024 * 1024)),
+        "random_page_cost": "1.1" if ssd else "4",
+        "effective_io_concurrency": "200" if ssd else "2",
+        # Fewer forced checkpoints during bulk scraper inserts
+        "max_wal_size": str(min(max(memory_kib // 1024 // 2, 2048), 16384)),
+        **PG_STAT_STATEMENTS_PARAMETERS,
+    }
+    parameters.update(overrides or {})
+    return parameters
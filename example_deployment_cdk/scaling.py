@@ -0,0 +1,124 @@
+from typing import Sequence
+
+from aws_cdk import (
+    aws_applicationautoscaling as appscaling,
+    aws_autoscaling as autoscaling,
+    Duration,
+    TimeZone,
+)
+from constructs import Construct
+
+PREDICTIVE_SCALING_MODES = ("ForecastAndScale", "ForecastOnly")
+
+# Day names in unix cron order (0 = Sunday, 7 is Sunday again); AWS cron accepts the same names
+DAY_NAMES = ("SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT")
+
+
+def add_scheduled_actions(asg: autoscaling.AutoScalingGroup,
+                          actions: Sequence[autoscaling.BasicScheduledActionProps]) -> None:
+    """Apply scheduled capacity changes (e.g. ahead of known crawl windows) to an Auto Scaling Group."""
+    for index, action in enumerate(actions):
+        asg.scale_on_schedule(f"ScheduledAction{index}",
+            schedule=action.schedule,
+            min_capacity=action.min_capacity,
+            max_capacity=action.max_capacity,
+            desired_capacity=action.desired_capacity,
+            start_time=action.start_time,
+            end_time=action.end_time,
+            time_zone=action.time_zone
+        )
+
+
+def _day_number(value: str) -> int:
+    if value.upper() in DAY_NAMES:
+        return DAY_NAMES.index(value.upper())
+    if not value.isdigit() or int(value) > 7:
+        raise ValueError(f"Cannot translate day-of-week {value!r} to an Application Auto Scaling schedule")
+    return int(value) % 7
+
+
+def _aws_day_of_week(field: str) -> str:
+    """Translate a unix cron day-of-week field into an explicit list of AWS cron day names.
+
+    Ranges and steps are expanded, so unix ranges wrapping past Saturday ("5-7") translate too.
+    """
+    days = set()
+    for part in field.split(","):
+        span, _, step = part.partition("/")
+        if span == "*":
+            first, last = 0, 6
+        elif "-" in span:
+            start, end = span.split("-", 1)
+            first, last = _day_number(start), _day_number(end)
+            if end == "7":
+                last = 7
+            if last < first:
+                last += 7
+        else:
+            first = last = _day_number(span)
+        if step and not step.isdigit():
+            raise ValueError(f"Cannot translate day-of-week step {part!r} to an Application Auto Scaling schedule")
+        days.update(day % 7 for day in range(first, last + 1, int(step or 1)))
+    return ",".join(DAY_NAMES[day] for day in sorted(days))
+
+
+def add_scheduled_task_count_actions(scaling: appscaling.BaseScalableAttribute,
+                                     actions: Sequence[autoscaling.BasicScheduledActionProps]) -> None:
+    """Apply the same scheduled actions to an Application Auto Scaling target (e.g. a Fargate service).
+
+    Application Auto Scaling only schedules min/max capacity and uses the six-field AWS
+    cron syntax, in which one of day-of-month and day-of-week must be "?". desired_capacity
+    and schedules restricting both days (unix cron matches either) are rejected.
+    """
+    for index, action in enumerate(actions):
+        if action.desired_capacity is not None:
+            raise ValueError("Scheduled actions for a Fargate service must set min/max capacity, not desired_capacity")
+        minute, hour, day, month, day_of_week = action.schedule.expression_string.split()
+        if day_of_week == "*":
+            expression = f"cron({minute} {hour} {day} {month} ? *)"
+        elif day == "*":
+            expression = f"cron({minute} {hour} ? {month} {_aws_day_of_week(day_of_week)} *)"
+        else:
+            raise ValueError(
+                "Scheduled actions for a Fargate service cannot restrict both day-of-month and day-of-week"
+            )
+        scaling.scale_on_schedule(f"ScheduledAction{index}",
+            schedule=appscaling.Schedule.expression(expression),
+            min_capacity=action.min_capacity,
+            max_capacity=action.max_capacity,
+            start_time=action.start_time,
+            end_time=action.end_time,
+            # EC2 Auto Scaling takes the IANA name, Application Auto Scaling a TimeZone
+            time_zone=TimeZone.of(action.time_zone) if action.time_zone else None
+        )
+
+
+def add_predictive_request_scaling(scope: Construct, construct_id: str, *,
+                                   asg: autoscaling.AutoScalingGroup,
+                                   resource_label: str,
+                                   target_requests_per_minute: int,
+                                   mode: str = "ForecastAndScale",
+                                   scheduling_buffer: Duration = Duration.minutes(10)) -> autoscaling.CfnScalingPolicy:
+    """Add a predictive scaling policy forecasting ALB request count for an Auto Scaling Group.
+
+    The L2 construct has no predictive scaling support, so the policy is rendered on
+    the L1 resource. resource_label is "<load balancer full name>/<target group full name>".
+    """
+    if mode not in PREDICTIVE_SCALING_MODES:
+        raise ValueError(f"Predictive scaling mode must be one of {PREDICTIVE_SCALING_MODES}, got {mode!r}")
+
+    return autoscaling.CfnScalingPolicy(scope, construct_id,
+        auto_scaling_group_name=asg.auto_scaling_group_name,
+        policy_type="PredictiveScaling",
+        predictive_scaling_configuration=autoscaling.CfnScalingPolicy.PredictiveScalingConfigurationProperty(
+            metric_specifications=[autoscaling.CfnScalingPolicy.PredictiveScalingMetricSpecificationProperty(
+                target_value=target_requests_per_minute,
+                predefined_metric_pair_specification=autoscaling.CfnScalingPolicy.PredictiveScalingPredefinedMetricPairProperty(
+                    predefined_metric_type="ALBRequestCount",
+                    resource_label=resource_label
+                )
+            )],
+            mode=mode,
+            scheduling_buffer_time=int(scheduling_buffer.to_seconds())
+        )
+    )
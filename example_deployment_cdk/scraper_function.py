@@ -0,0 +1,64 @@
+from typing import Mapping, Optional
+
+from aws_cdk import (
+    aws_ec2 as ec2,
+    aws_lambda as lambda_,
+    aws_lambda_event_sources as lambda_event_sources,
+    aws_sqs as sqs,
+    Duration,
+)
+from constructs import Construct
+
+
+class ScraperFunction(Construct):
+    """SQS job queue fanned out to a VPC-attached Lambda function for short, single-page scrapes."""
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 vpc: ec2.IVpc,
+                 security_group: ec2.ISecurityGroup,
+                 code_path: str,
+                 architecture: lambda_.Architecture,
+                 handler: str = "handler.handler",
+                 memory_size: int = 512,
+                 timeout: Duration = Duration.seconds(30),
+                 reserved_concurrent_executions: Optional[int] = 100,
+                 batch_size: int = 10,
+                 max_batching_window: Duration = Duration.seconds(5),
+                 max_receive_count: int = 5,
+                 environment: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__(scope, construct_id)
+
+        # Create job queue; visibility timeout covers several invocation attempts as AWS recommends
+        self.dead_letter_queue = sqs.Queue(self, "DeadLetterQueue",
+            retention_period=Duration.days(14)
+        )
+
+        self.job_queue = sqs.Queue(self, "JobQueue",
+            visibility_timeout=Duration.seconds(timeout.to_seconds() * 6),
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=max_receive_count,
+                queue=self.dead_letter_queue
+            )
+        )
+
+        # Create Lambda Function in the private subnets so it can reach the database
+        self.function = lambda_.Function(self, "Function",
+            runtime=lambda_.Runtime.PYTHON_3_12,
+            architecture=architecture,
+            handler=handler,
+            code=lambda_.Code.from_asset(code_path),
+            memory_size=memory_size,
+            timeout=timeout,
+            vpc=vpc,
+            vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+            security_groups=[security_group],
+            reserved_concurrent_executions=reserved_concurrent_executions,
+            environment=dict(environment or {})
+        )
+
+        # Feed the function from the queue; failed records are retried individually
+        self.function.add_event_source(lambda_event_sources.SqsEventSource(self.job_queue,
+            batch_size=batch_size,
+            max_batching_window=max_batching_window,
+            report_batch_item_failures=True
+        ))
@@ -0,0 +1,138 @@
+from typing import Optional, Sequence
+
+from aws_cdk import (
+    aws_autoscaling as autoscaling,
+    aws_ec2 as ec2,
+    aws_iam as iam,
+    aws_sqs as sqs,
+    Duration,
+)
+from constructs import Construct
+
+from .os_tuning import KernelProfile
+from .user_data import scraper_user_data
+
+
+class ScraperWorkers(Construct):
+    """SQS job queue drained by a Spot-backed Auto Scaling Group of scraper workers.
+
+    Desired capacity tracks the backlog per in-service instance, so a burst of
+    queued URLs scales the fleet out and an empty queue drains it back to zero.
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 vpc: ec2.IVpc,
+                 security_group: ec2.ISecurityGroup,
+                 role: iam.IRole,
+                 machine_image: ec2.IMachineImage,
+                 instance_types: Sequence[ec2.InstanceType],
+                 worker_command: str,
+                 vpc_subnets: Optional[ec2.SubnetSelection] = None,
+                 key_name: Optional[str] = None,
+                 cpu_credits: Optional[ec2.CpuCredits] = None,
+                 kernel_profile: Optional[KernelProfile] = None,
+                 min_capacity: int = 0,
+                 max_capacity: int = 10,
+                 on_demand_base_capacity: int = 0,
+                 on_demand_percentage_above_base_capacity: int = 0,
+                 backlog_per_instance: int = 100,
+                 visibility_timeout: Duration = Duration.minutes(5),
+                 max_receive_count: int = 5) -> None:
+        super().__init__(scope, construct_id)
+
+        # Create job queue; messages that keep failing end up in the dead-letter queue
+        self.dead_letter_queue = sqs.Queue(self, "DeadLetterQueue",
+            retention_period=Duration.days(14)
+        )
+
+        self.job_queue = sqs.Queue(self, "JobQueue",
+            visibility_timeout=visibility_timeout,
+            dead_letter_queue=sqs.DeadLetterQueue(
+                max_receive_count=max_receive_count,
+                queue=self.dead_letter_queue
+            )
+        )
+
+        self.job_queue.grant_consume_messages(role)
+
+        # Create Launch Template; the instance type comes from the overrides below
+        launch_template = ec2.LaunchTemplate(self, "LaunchTemplate",
+            machine_image=machine_image,
+            security_group=security_group,
+            role=role,
+            key_name=key_name,
+            cpu_credits=cpu_credits,
+            user_data=scraper_user_data(worker_command, self.job_queue.queue_url, kernel_profile)
+        )
+
+        # Create Auto Scaling Group with on-demand base capacity and capacity-optimized Spot above it
+        self.auto_scaling_group = autoscaling.AutoScalingGroup(self, "AutoScalingGroup",
+            vpc=vpc,
+            vpc_subnets=vpc_subnets or ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+            min_capacity=min_capacity,
+            max_capacity=max_capacity,
+            capacity_rebalance=True,
+            group_metrics=[autoscaling.GroupMetrics(autoscaling.GroupMetric.IN_SERVICE_INSTANCES)],
+            mixed_instances_policy=autoscaling.MixedInstancesPolicy(
+                launch_template=launch_template,
+                launch_template_overrides=[
+                    autoscaling.LaunchTemplateOverrides(instance_type=instance_type)
+                    for instance_type in instance_types
+                ],
+                instances_distribution=autoscaling.InstancesDistribution(
+                    on_demand_base_capacity=on_demand_base_capacity,
+                    on_demand_percentage_above_base_capacity=on_demand_percentage_above_base_capacity,
+                    spot_allocation_strategy=autoscaling.SpotAllocationStrategy.CAPACITY_OPTIMIZED
+                )
+            )
+        )
+
+        # Track queued messages per in-service instance. The L2 target tracking
+        # policy only accepts a single metric, and the L1 property types of the
+        # pinned CDK release predate metric math, so the metrics are written as a
+        # raw property override. With no instances running the whole backlog
+        # counts, which lets the group scale out from zero.
+        policy = autoscaling.CfnScalingPolicy(self, "BacklogPerInstanceScaling",
+            auto_scaling_group_name=self.auto_scaling_group.auto_scaling_group_name,
+            policy_type="TargetTrackingScaling",
+            target_tracking_configuration=autoscaling.CfnScalingPolicy.TargetTrackingConfigurationProperty(
+                target_value=backlog_per_instance
+            )
+        )
+        policy.add_property_override("TargetTrackingConfiguration.CustomizedMetricSpecification", {
+            "Metrics": [
+                {
+                    "Id": "visible",
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": "AWS/SQS",
+                            "MetricName": "ApproximateNumberOfMessagesVisible",
+                            "Dimensions": [{"Name": "QueueName", "Value": self.job_queue.queue_name}]
+                        },
+                        "Stat": "Sum"
+                    },
+                    "ReturnData": False
+                },
+                {
+                    "Id": "in_service",
+                    "MetricStat": {
+                        "Metric": {
+                            "Namespace": "AWS/AutoScaling",
+                            "MetricName": "GroupInServiceInstances",
+                            "Dimensions": [{
+                                "Name": "AutoScalingGroupName",
+                                "Value": self.auto_scaling_group.auto_scaling_group_name
+                            }]
+                        },
+                        "Stat": "Average"
+                    },
+                    "ReturnData": False
+                },
+                {
+                    "Id": "backlog_per_instance",
+                    "Expression": "IF(in_service > 0, visible / in_service, visible)",
+                    "Label": "Backlog per instance",
+                    "ReturnData": True
+                }
+            ]
+        })
@@ -0,0 +1,85 @@
+from aws_cdk import (
+    aws_cloudfront as cloudfront,
+    aws_cloudfront_origins as origins,
+    aws_s3 as s3,
+    Duration,
+    RemovalPolicy,
+)
+from constructs import Construct
+
+
+class StaticAssets(Construct):
+    """S3 bucket for Django static/media files served through a CloudFront distribution.
+
+    Files under /static/ are expected to carry a content hash in their name
+    (ManifestStaticFilesStorage), so they are cached for a year and marked immutable.
+    Media files keep a short TTL because uploads can be replaced under the same key.
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, *,
+                 static_max_age: Duration = Duration.days(365),
+                 media_max_age: Duration = Duration.days(1)) -> None:
+        super().__init__(scope, construct_id)
+
+        # Create private bucket; only CloudFront reads from it
+        self.bucket = s3.Bucket(self, "Bucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            enforce_ssl=True,
+            removal_policy=RemovalPolicy.DESTROY,
+            auto_delete_objects=True
+        )
+
+        origin = origins.S3Origin(self.bucket)
+
+        # Hashed static files: cache for the full max age at the edge and in browsers
+        static_cache_policy = cloudfront.CachePolicy(self, "StaticCachePolicy",
+            default_ttl=static_max_age,
+            min_ttl=static_max_age,
+            max_ttl=static_max_age,
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True
+        )
+
+        static_headers = cloudfront.ResponseHeadersPolicy(self, "StaticCacheHeaders",
+            custom_headers_behavior=cloudfront.ResponseCustomHeadersBehavior(custom_headers=[
+                cloudfront.ResponseCustomHeader(
+                    header="Cache-Control",
+                    value=f"public, max-age={int(static_max_age.to_seconds())}, immutable",
+                    override=True
+                )
+            ])
+        )
+
+        media_headers = cloudfront.ResponseHeadersPolicy(self, "MediaCacheHeaders",
+            custom_headers_behavior=cloudfront.ResponseCustomHeadersBehavior(custom_headers=[
+                cloudfront.ResponseCustomHeader(
+                    header="Cache-Control",
+                    value=f"public, max-age={int(media_max_age.to_seconds())}",
+                    override=False
+                )
+            ])
+        )
+
+        # Create CloudFront Distribution
+        self.distribution = cloudfront.Distribution(self, "Distribution",
+            default_behavior=cloudfront.BehaviorOptions(
+                origin=origin,
+                viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED
+            ),
+            additional_behaviors={
+                "/static/*": cloudfront.BehaviorOptions(
+                    origin=origin,
+                    viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                    cache_policy=static_cache_policy,
+                    response_headers_policy=static_headers
+                ),
+                "/media/*": cloudfront.BehaviorOptions(
+                    origin=origin,
+                    viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                    cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                    response_headers_policy=media_headers
+                ),
+            }
+        )
@@ -0,0 +1,205 @@
+import re
+from textwrap import dedent
+from typing import List, Optional
+
+from aws_cdk import aws_ec2 as ec2
+
+from .asgi_server import TUNED_WORKER_DIR, AsgiServerSettings, gunicorn_command, render_tuned_worker
+from .nginx import UVICORN_SOCKET, NginxSettings, render_nginx_conf
+from .os_tuning import LIMITS_CONF, SYSCTL_CONF, KernelProfile, render_limits_conf, render_sysctl_conf
+
+APP_DIR = "/home/ec2-user/app"
+COMPLETE_LIFECYCLE_ACTION = "/usr/local/bin/complete-lifecycle-action"
+
+# Packages every host needs before the application is deployed
+BOOTSTRAP_COMMANDS = [
+    "yum update -y",
+    "amazon-linux-extras enable postgresql14",
+    "yum install -y postgresql",
+    "yum install -y python3 python3-pip git",
+    # Update libpq
+    #"yum install -y https://download.postgresql.org/pub/repos/yum/reporpms/EL-7-x86_64/pgdg-redhat-repo-latest.noarch.rpm",
+    #"yum install -y postgresql14-libs",
+]
+
+
+def write_file_commands(path: str, content: str) -> List[str]:
+    """Return shell commands writing content to path verbatim (no shell expansion)."""
+    return [
+        f"cat << 'EOF' > {path}",
+        # Optional directives render as empty lines; collapse the resulting runs
+        re.sub(r"\n{3,}", "\n\n", dedent(content).strip()),
+        "EOF",
+    ]
+
+
+def systemd_unit_commands(name: str, unit: str) -> List[str]:
+    """Return shell commands installing and enabling a systemd unit."""
+    return [
+        *write_file_commands(f"/etc/systemd/system/{name}", unit),
+        # Reload systemd to recognize the new unit
+        "systemctl daemon-reload",
+        # Enable the unit to start on boot
+        f"systemctl enable {name}",
+    ]
+
+
+def kernel_tuning_commands(profile: Optional[KernelProfile]) -> List[str]:
+    """Return shell commands applying a kernel profile's sysctls and login nofile limits."""
+    if profile is None:
+        return []
+    return [
+        *write_file_commands(SYSCTL_CONF, render_sysctl_conf(profile)),
+        "sysctl --system",
+        *write_file_commands(LIMITS_CONF, render_limits_conf(profile)),
+    ]
+
+
+def _limit_nofile(profile: Optional[KernelProfile]) -> str:
+    return f"LimitNOFILE={profile.nofile}" if profile else ""
+
+
+def render_uvicorn_socket(settings: AsgiServerSettings) -> str:
+    """Render the uvicorn.socket unit.
+
+    systemd owns the listening socket, so connections queue in the kernel rather
+    than being refused while the service restarts. Only nginx may connect.
+    """
+    return f"""
+        [Unit]
+        Description=uvicorn socket
+
+        [Socket]
+        ListenStream={UVICORN_SOCKET}
+        SocketUser=ec2-user
+        SocketGroup=nginx
+        SocketMode=0660
+        Backlog={settings.backlog}
+
+        [Install]
+        WantedBy=sockets.target
+    """
+
+
+def render_uvicorn_service(settings: AsgiServerSettings, kernel_profile: Optional[KernelProfile] = None) -> str:
+    """Render the uvicorn.service unit: gunicorn managing one uvicorn worker per vCPU.
+
+    gunicorn serves the socket inherited from uvicorn.socket. `systemctl reload
+    uvicorn` sends SIGHUP, on which gunicorn starts fresh workers (loading new
+    code and config) and retires the old ones gracefully, so deploys never drop
+    in-flight requests.
+    """
+    return f"""
+        [Unit]
+        Description=uvicorn daemon
+        Requires=uvicorn.socket
+        After=network.target
+
+        [Service]
+        Type=notify
+        NotifyAccess=main
+        User=ec2-user
+        Group=ec2-user
+        WorkingDirectory={APP_DIR}
+        Environment="PYTHONPATH={APP_DIR}:{TUNED_WORKER_DIR}"
+        ExecStart={gunicorn_command(f"{APP_DIR}/venv", settings, f"unix:{UVICORN_SOCKET}")}
+        ExecReload=/bin/kill -s HUP $MAINPID
+        KillMode=mixed
+        TimeoutStopSec={settings.graceful_timeout_seconds + 5}
+        {_limit_nofile(kernel_profile)}
+
+        [Install]
+        WantedBy=multi-user.target
+    """
+
+
+def render_complete_lifecycle_action(hook_name: str) -> str:
+    """Render a script completing the instance's pending Auto Scaling launch lifecycle action."""
+    return f"""
+        #!/bin/bash
+        TOKEN=$(curl -s -X PUT http://169.254.169.254/latest/api/token -H "X-aws-ec2-metadata-token-ttl-seconds: 60")
+        INSTANCE_ID=$(curl -s -H "X-aws-ec2-metadata-token: $TOKEN" http://169.254.169.254/latest/meta-data/instance-id)
+        REGION=$(curl -s -H "X-aws-ec2-metadata-token: $TOKEN" http://169.254.169.254/latest/meta-data/placement/region)
+        # Look the group up at runtime; referencing it from the launch template would be circular
+        ASG_NAME=$(aws autoscaling describe-auto-scaling-instances --region "$REGION" --instance-ids "$INSTANCE_ID" --query "AutoScalingInstances[0].AutoScalingGroupName" --output text)
+        aws autoscaling complete-lifecycle-action --region "$REGION" --auto-scaling-group-name "$ASG_NAME" --lifecycle-hook-name {hook_name} --instance-id "$INSTANCE_ID" --lifecycle-action-result CONTINUE
+    """
+
+
+def lifecycle_action_commands(hook_name: str) -> List[str]:
+    """Return shell commands completing the launch lifecycle action now and on every later boot.
+
+    Warm-pool instances pass through the launch hook again when they are started
+    into service, but user data only runs on the first boot, so a oneshot unit
+    completes the action on restarts.
+    """
+    return [
+        *write_file_commands(COMPLETE_LIFECYCLE_ACTION, render_complete_lifecycle_action(hook_name)),
+        f"chmod +x {COMPLETE_LIFECYCLE_ACTION}",
+        *systemd_unit_commands("complete-lifecycle-action.service", f"""
+            [Unit]
+            Description=complete Auto Scaling launch lifecycle action
+            Wants=network-online.target
+            After=network-online.target nginx.service uvicorn.socket
+
+            [Service]
+            Type=oneshot
+            ExecStart={COMPLETE_LIFECYCLE_ACTION}
+
+            [Install]
+            WantedBy=multi-user.target
+        """),
+        # Last step of the bootstrap: only now may Auto Scaling stop or serve the instance
+        COMPLETE_LIFECYCLE_ACTION,
+    ]
+
+
+def api_user_data(settings: AsgiServerSettings, nginx: NginxSettings,
+                  kernel_profile: Optional[KernelProfile] = None,
+                  lifecycle_hook_name: Optional[str] = None) -> ec2.UserData:
+    """User data for API hosts: bootstrap packages, OS tuning, nginx and the uvicorn service.
+
+    With a launch lifecycle hook the instance reports back once bootstrapping is done.
+    """
+    user_data = ec2.UserData.for_linux()
+    user_data.add_commands(*BOOTSTRAP_COMMANDS)
+    user_data.add_commands(*kernel_tuning_commands(kernel_profile))
+    user_data.add_commands("amazon-linux-extras install -y nginx1")
+    user_data.add_commands(*write_file_commands("/etc/nginx/nginx.conf", render_nginx_conf(nginx)))
+    if settings.needs_tuned_worker:
+        user_data.add_commands(f"mkdir -p {TUNED_WORKER_DIR}")
+        user_data.add_commands(*write_file_commands(f"{TUNED_WORKER_DIR}/tuned_worker.py", render_tuned_worker(settings)))
+    user_data.add_commands(*systemd_unit_commands("uvicorn.socket", render_uvicorn_socket(settings)))
+    user_data.add_commands(*systemd_unit_commands("uvicorn.service", render_uvicorn_service(settings, kernel_profile)))
+    user_data.add_commands("systemctl enable nginx")
+    if lifecycle_hook_name:
+        user_data.add_commands(*lifecycle_action_commands(lifecycle_hook_name))
+    return user_data
+
+
+def scraper_user_data(worker_command: str, queue_url: str,
+                      kernel_profile: Optional[KernelProfile] = None) -> ec2.UserData:
+    """User data for scraper hosts: bootstrap packages, OS tuning and the scraper worker service."""
+    user_data = ec2.UserData.for_linux()
+    user_data.add_commands(*BOOTSTRAP_COMMANDS)
+    user_data.add_commands(*kernel_tuning_commands(kernel_profile))
+    user_data.add_commands(*systemd_unit_commands("scraper-worker.service", f"""
+        [Unit]
+        Description=scraper worker
+        After=network.target
+
+        [Service]
+        User=ec2-user
+        Group=ec2-user
+        WorkingDirectory={APP_DIR}
+        Environment="PYTHONPATH={APP_DIR}"
+        Environment="SCRAPER_QUEUE_URL={queue_url}"
+        ExecStart={worker_command}
+        Restart=always
+        RestartSec=5
+        {_limit_nofile(kernel_profile)}
+
+        [Install]
+        WantedBy=multi-user.target
+    """))
+    return user_data
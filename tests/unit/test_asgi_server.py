@@ -0,0 +1,76 @@
+import pytest
+
+from example_deployment_cdk.asgi_server import (
+    TUNED_WORKER_CLASS,
+    AsgiServerSettings,
+    gunicorn_command,
+    render_tuned_worker,
+    uvicorn_command,
+)
+
+
+def test_gunicorn_command_runs_uvicorn_workers():
+    settings = AsgiServerSettings(workers=4, graceful_timeout_seconds=20, max_requests=1000)
+    command = gunicorn_command("/venv", settings, "0.0.0.0:8000")
+
+    assert command.startswith("/venv/bin/gunicorn api_project.asgi:application")
+    assert "--worker-class uvicorn.workers.UvicornWorker" in command
+    assert "--workers 4" in command
+    assert "--graceful-timeout 20" in command
+    assert "--max-requests 1000 --max-requests-jitter 100" in command
+
+
+def test_max_requests_recycling_is_off_by_default():
+    settings = AsgiServerSettings(workers=2)
+
+    assert "--max-requests" not in gunicorn_command("/venv", settings, "0.0.0.0:8000")
+    assert "--limit-max-requests" not in uvicorn_command(settings, 8000)
+
+
+def test_uvicorn_command_uses_worker_count():
+    command = uvicorn_command(AsgiServerSettings(workers=3), 8000)
+
+    assert command[command.index("--workers") + 1] == "3"
+
+
+def test_worker_count_must_be_positive():
+    with pytest.raises(ValueError):
+        AsgiServerSettings(workers=0)
+
+
+def test_stock_worker_is_used_without_uvicorn_tuning():
+    command = gunicorn_command("/venv", AsgiServerSettings(workers=2), "unix:/run/uvicorn.sock")
+
+    assert "--worker-class uvicorn.workers.UvicornWorker" in command
+    assert "--keep-alive 75" in command
+
+
+def test_uvicorn_tuning_uses_generated_worker_class():
+    settings = AsgiServerSettings(workers=2, loop="uvloop", http="httptools", limit_concurrency=500)
+    worker = render_tuned_worker(settings)
+
+    assert f"--worker-class {TUNED_WORKER_CLASS}" in gunicorn_command("/venv", settings, "unix:/run/uvicorn.sock")
+    assert "class TunedUvicornWorker(UvicornWorker):" in worker
+    assert "'loop': 'uvloop'" in worker
+    assert "'limit_concurrency': 500" in worker
+    compile(worker, "tuned_worker.py", "exec")
+
+
+def test_uvicorn_command_passes_tuning_flags():
+    command = uvicorn_command(AsgiServerSettings(workers=2, loop="uvloop", backlog=4096, limit_concurrency=100), 8000)
+
+    assert command[command.index("--loop") + 1] == "uvloop"
+    assert command[command.index("--backlog") + 1] == "4096"
+    assert command[command.index("--limit-concurrency") + 1] == "100"
+
+
+@pytest.mark.parametrize("overrides", [
+    {"loop": "trio"},
+    {"http": "h2"},
+    {"backlog": 0},
+    {"limit_concurrency": 0},
+    {"timeout_keep_alive_seconds": 0},
+])
+def test_uvicorn_tuning_is_validated(overrides):
+    with pytest.raises(ValueError):
+        AsgiServerSettings(workers=2, **overrides)
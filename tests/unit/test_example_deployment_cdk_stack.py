@@ -1,6 +1,9 @@
 import aws_cdk as core
 import aws_cdk.assertions as assertions
+import pytest
+from aws_cdk import aws_autoscaling as autoscaling, aws_ec2 as ec2
 
+from example_deployment_cdk.api_cdn import ApiCacheBehavior
 from example_deployment_cdk.example_deployment_cdk_stack import ExampleDeploymentCdkStack
 
 # example tests. To run these tests, uncomment this file along with the example
@@ -13,3 +16,668 @@ def test_sqs_queue_created():
 #     template.has_resource_properties("AWS::SQS::Queue", {
 #         "VisibilityTimeout": 300
 #     })
+
+
+def test_api_tier_is_autoscaled_behind_alb():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::EC2::Instance", 0)
+    template.resource_count_is("AWS::AutoScaling::AutoScalingGroup", 2)
+    template.resource_count_is("AWS::ElasticLoadBalancingV2::LoadBalancer", 1)
+    template.has_resource_properties("AWS::AutoScaling::ScalingPolicy", {
+        "PolicyType": "TargetTrackingScaling",
+        "TargetTrackingConfiguration": {
+            "PredefinedMetricSpecification": {
+                "PredefinedMetricType": "ALBRequestCountPerTarget"
+            },
+            "TargetValue": 1000
+        }
+    })
+    template.has_output("LoadBalancerDNS", {})
+    template.has_output("AutoScalingGroupName", {})
+
+
+def test_graviton_architecture_uses_arm_instance_type():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        cpu_architecture=ec2.InstanceArchitecture.ARM_64
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "InstanceType": "t4g.micro"
+        })
+    })
+
+
+def test_mismatched_instance_type_and_architecture_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+            cpu_architecture=ec2.InstanceArchitecture.ARM_64,
+            api_instance_type="t3.micro"
+        )
+
+
+def test_api_warm_pool_is_optional():
+    app = core.App()
+    default_stack = ExampleDeploymentCdkStack(app, "default-stack")
+    warm_stack = ExampleDeploymentCdkStack(app, "warm-stack",
+        api_warm_pool=True,
+        api_warm_pool_min_size=2
+    )
+
+    assertions.Template.from_stack(default_stack).resource_count_is("AWS::AutoScaling::WarmPool", 0)
+    assertions.Template.from_stack(warm_stack).has_resource_properties("AWS::AutoScaling::WarmPool", {
+        "MinSize": 2,
+        "PoolState": "Stopped",
+        "InstanceReusePolicy": {"ReuseOnScaleIn": True}
+    })
+    assertions.Template.from_stack(warm_stack).has_resource_properties("AWS::AutoScaling::LifecycleHook", {
+        "LifecycleHookName": "api-bootstrap",
+        "LifecycleTransition": "autoscaling:EC2_INSTANCE_LAUNCHING"
+    })
+    assertions.Template.from_stack(warm_stack).has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("complete-lifecycle-action")}
+        })
+    })
+
+
+def test_scraper_workers_use_spot_mixed_instances():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        scraper_instance_types=["c5.large", "c6i.large"],
+        scraper_on_demand_base_capacity=1
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::AutoScaling::AutoScalingGroup", {
+        "CapacityRebalance": True,
+        "MixedInstancesPolicy": {
+            "InstancesDistribution": {
+                "OnDemandBaseCapacity": 1,
+                "OnDemandPercentageAboveBaseCapacity": 0,
+                "SpotAllocationStrategy": "capacity-optimized"
+            },
+            "LaunchTemplate": assertions.Match.object_like({
+                "Overrides": [
+                    {"InstanceType": "c5.large"},
+                    {"InstanceType": "c6i.large"}
+                ]
+            })
+        }
+    })
+
+
+def test_scraper_workers_scale_on_backlog_per_instance():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        scraper_backlog_per_instance=250
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::SQS::Queue", 2)
+    template.has_resource_properties("AWS::SQS::Queue", {
+        "RedrivePolicy": assertions.Match.object_like({"maxReceiveCount": 5})
+    })
+    template.has_resource_properties("AWS::AutoScaling::ScalingPolicy", {
+        "TargetTrackingConfiguration": {
+            "TargetValue": 250,
+            "CustomizedMetricSpecification": {
+                "Metrics": assertions.Match.array_with([
+                    assertions.Match.object_like({
+                        "Id": "backlog_per_instance",
+                        "Expression": "IF(in_service > 0, visible / in_service, visible)",
+                        "ReturnData": True
+                    })
+                ])
+            }
+        }
+    })
+
+
+def test_scheduled_and_predictive_scaling():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_scheduled_actions=[autoscaling.BasicScheduledActionProps(
+            schedule=autoscaling.Schedule.cron(hour="5", minute="45"),
+            min_capacity=3
+        )],
+        api_predictive_scaling=True
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::AutoScaling::ScheduledAction", {
+        "Recurrence": "45 5 * * *",
+        "MinSize": 3
+    })
+    template.has_resource_properties("AWS::AutoScaling::ScalingPolicy", {
+        "PolicyType": "PredictiveScaling",
+        "PredictiveScalingConfiguration": assertions.Match.object_like({
+            "Mode": "ForecastAndScale",
+            "SchedulingBufferTime": 600
+        })
+    })
+
+
+def test_invalid_predictive_scaling_mode_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+            api_predictive_scaling=True,
+            api_predictive_scaling_mode="ScaleOnly"
+        )
+
+
+def test_fargate_api_mode():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_compute="fargate",
+        api_container_image="public.ecr.aws/example/api:latest"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::ECS::Service", 1)
+    template.has_resource_properties("AWS::ECS::Service", {"DesiredCount": assertions.Match.absent()})
+    template.resource_count_is("AWS::AutoScaling::AutoScalingGroup", 1)
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "TargetTrackingScalingPolicyConfiguration": assertions.Match.object_like({
+            "PredefinedMetricSpecification": assertions.Match.object_like({
+                "PredefinedMetricType": "ALBRequestCountPerTarget"
+            })
+        })
+    })
+    template.has_output("ApiServiceName", {})
+
+
+def test_fargate_scheduled_actions_translate_day_of_week():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_compute="fargate",
+        api_container_image="public.ecr.aws/example/api:latest",
+        api_scheduled_actions=[autoscaling.BasicScheduledActionProps(
+            schedule=autoscaling.Schedule.cron(hour="7", minute="30", week_day="1-5"),
+            min_capacity=4
+        )]
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "ScheduledActions": [assertions.Match.object_like({
+            "Schedule": "cron(30 7 ? * MON,TUE,WED,THU,FRI *)",
+            "ScalableTargetAction": {"MinCapacity": 4}
+        })]
+    })
+
+
+def test_fargate_scheduled_actions_keep_their_time_zone():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_compute="fargate",
+        api_container_image="public.ecr.aws/example/api:latest",
+        api_scheduled_actions=[autoscaling.BasicScheduledActionProps(
+            schedule=autoscaling.Schedule.cron(hour="6", minute="0"),
+            min_capacity=2,
+            time_zone="Europe/Madrid"
+        )]
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "ScheduledActions": [assertions.Match.object_like({
+            "Schedule": "cron(0 6 * * ? *)",
+            "Timezone": "Europe/Madrid"
+        })]
+    })
+
+
+def test_fargate_api_mode_requires_container_image():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", api_compute="fargate")
+
+
+def test_scraper_lambda_is_fed_from_sqs(tmp_path):
+    (tmp_path / "handler.py").write_text("def handler(event, context):\n    return {}\n")
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        scraper_lambda=True,
+        scraper_lambda_code_path=str(tmp_path),
+        scraper_lambda_reserved_concurrency=200
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::Lambda::Function", {
+        "Runtime": "python3.12",
+        "ReservedConcurrentExecutions": 200,
+        "VpcConfig": assertions.Match.any_value()
+    })
+    template.has_resource_properties("AWS::Lambda::EventSourceMapping", {
+        "BatchSize": 10,
+        "MaximumBatchingWindowInSeconds": 5,
+        "FunctionResponseTypes": ["ReportBatchItemFailures"]
+    })
+
+
+def test_scraper_lambda_requires_application_code():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", scraper_lambda=True)
+
+
+def test_burstable_profile_sets_unlimited_credits_and_alarm():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "InstanceType": "t3.micro",
+            "CreditSpecification": {"CpuCredits": "unlimited"}
+        })
+    })
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {
+        "MetricName": "CPUCreditBalance",
+        "Namespace": "AWS/RDS"
+    })
+
+
+def test_general_purpose_profiles_drop_credit_alarms():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_performance_profile="general-purpose",
+        db_performance_profile="general-purpose"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "DBInstanceClass": "db.m6g.large"
+    })
+    assert template.find_resources("AWS::CloudWatch::Alarm", {
+        "Properties": {"MetricName": "CPUCreditBalance"}
+    }) == {}
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {"MetricName": "DiskQueueDepth"})
+
+
+def test_instance_type_outside_profile_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+            api_performance_profile="compute-optimized",
+            api_instance_type="t3.large"
+        )
+
+
+def test_app_tier_can_be_pinned_to_database_az():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        pin_app_to_database_az=True
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "AvailabilityZone": assertions.Match.any_value()
+    })
+    template.has_resource_properties("AWS::AutoScaling::AutoScalingGroup", {
+        "VPCZoneIdentifier": [assertions.Match.any_value()]
+    })
+    template.has_output("AppAvailabilityZone", {})
+
+
+def test_api_workers_are_sized_from_instance_vcpus():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_performance_profile="compute-optimized",
+        api_instance_type="c6i.2xlarge"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "InstanceType": "c6i.2xlarge",
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("gunicorn .* --workers 8 ")}
+        })
+    })
+
+
+def test_api_instances_serve_through_nginx():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::ElasticLoadBalancingV2::TargetGroup", {
+        "Port": 80,
+        "TargetType": "instance"
+    })
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("--bind unix:/run/uvicorn.sock")}
+        })
+    })
+
+
+def test_static_assets_are_served_from_cloudfront():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_count_is("AWS::S3::Bucket", 1)
+    template.has_resource_properties("AWS::CloudFront::ResponseHeadersPolicy", {
+        "ResponseHeadersPolicyConfig": assertions.Match.object_like({
+            "CustomHeadersConfig": {"Items": [{
+                "Header": "Cache-Control",
+                "Value": "public, max-age=31536000, immutable",
+                "Override": True
+            }]}
+        })
+    })
+    template.has_output("StaticCdnDomain", {})
+
+
+def test_api_cdn_caches_configured_paths():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_cdn=True,
+        api_cdn_cache_behaviors=[ApiCacheBehavior(
+            path_pattern="/api/results/*",
+            default_ttl_seconds=30,
+            query_strings=["page", "crawl"],
+            stale_while_revalidate_seconds=300
+        )]
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::CloudFront::CachePolicy", {
+        "CachePolicyConfig": assertions.Match.object_like({
+            "DefaultTTL": 30,
+            "ParametersInCacheKeyAndForwardedToOrigin": assertions.Match.object_like({
+                "QueryStringsConfig": {
+                    "QueryStringBehavior": "whitelist",
+                    "QueryStrings": ["page", "crawl"]
+                }
+            })
+        })
+    })
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp(
+                "stale-while-revalidate=300"
+            )}
+        })
+    })
+    template.has_output("ApiCdnDomain", {})
+    # Managed AllViewerExceptHostHeader policy: the origin is reached under its own host name
+    template.has_resource_properties("AWS::CloudFront::Distribution", {
+        "DistributionConfig": assertions.Match.object_like({
+            "DefaultCacheBehavior": assertions.Match.object_like({
+                "OriginRequestPolicyId": "b689b0a8-53d0-40ab-baf2-68738e2966ac"
+            })
+        })
+    })
+
+
+def test_api_cache_behavior_ttls_are_validated():
+    with pytest.raises(ValueError):
+        ApiCacheBehavior(path_pattern="/api/*", default_ttl_seconds=10, min_ttl_seconds=60)
+
+
+def test_nginx_micro_cache_is_rendered_for_configured_paths():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        nginx_micro_cache_paths=["/api/listings/*"]
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("proxy_cache_lock on;")}
+        })
+    })
+
+
+def test_https_listener_with_http_redirect():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_certificate_arn="arn:aws:acm:eu-south-2:123456789012:certificate/example"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::ElasticLoadBalancingV2::Listener", {
+        "Port": 443,
+        "Protocol": "HTTPS",
+        "Certificates": [{"CertificateArn": "arn:aws:acm:eu-south-2:123456789012:certificate/example"}]
+    })
+    template.has_resource_properties("AWS::ElasticLoadBalancingV2::Listener", {
+        "Port": 80,
+        "DefaultActions": [assertions.Match.object_like({
+            "Type": "redirect",
+            "RedirectConfig": assertions.Match.object_like({"Protocol": "HTTPS", "Port": "443"})
+        })]
+    })
+    # HTTP/2 is on by default on an ALB; CDK only renders the attribute to disable it
+    for load_balancer in template.find_resources("AWS::ElasticLoadBalancingV2::LoadBalancer").values():
+        assert {"Key": "routing.http2.enabled", "Value": "false"} not in load_balancer["Properties"].get(
+            "LoadBalancerAttributes", []
+        )
+
+
+def test_kernel_profiles_are_rendered_per_tier():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "InstanceType": "t3.micro",
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("net.core.somaxconn = 4096")}
+        })
+    })
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("listen 80 default_server backlog=4096;")}
+        })
+    })
+
+
+def test_unknown_kernel_profile_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", scraper_kernel_profile="turbo")
+
+
+def test_uvicorn_tuning_props_are_rendered():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        api_loop="uvloop",
+        api_http="httptools",
+        api_limit_concurrency=200
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::EC2::LaunchTemplate", {
+        "LaunchTemplateData": assertions.Match.object_like({
+            "UserData": {"Fn::Base64": assertions.Match.string_like_regexp("tuned_worker.TunedUvicornWorker")}
+        })
+    })
+
+
+def test_uvicorn_backlog_above_somaxconn_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", api_backlog=8192)
+
+
+def test_db_proxy_pools_connections_for_the_app():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_proxy=True,
+        db_proxy_max_connections_percent=75
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBProxy", {
+        "EngineFamily": "POSTGRESQL",
+        "RequireTLS": False
+    })
+    template.has_resource_properties("AWS::RDS::DBProxyTargetGroup", {
+        "ConnectionPoolConfigurationInfo": assertions.Match.object_like({
+            "MaxConnectionsPercent": 75,
+            "ConnectionBorrowTimeout": 120
+        })
+    })
+    template.has_output("DBInstanceEndpoint", {})
+
+
+def test_read_replicas_publish_reader_endpoints():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_read_replicas=2,
+        db_replica_instance_type="t3.small"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.resource_properties_count_is("AWS::RDS::DBInstance", {
+        "SourceDBInstanceIdentifier": assertions.Match.any_value(),
+        "DBInstanceClass": "db.t3.small"
+    }, 2)
+    template.has_resource_properties("AWS::SSM::Parameter", {"Type": "StringList"})
+    template.has_output("DBReaderEndpoint1", {})
+    template.has_output("DBReaderEndpoints", {})
+
+
+def test_db_parameter_group_is_tuned_for_instance_class():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_parameter_overrides={"random_page_cost": "1.5"}
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBParameterGroup", {
+        "Parameters": assertions.Match.object_like({
+            "rds.force_ssl": "0",
+            "password_encryption": "md5",
+            "shared_buffers": "32768",
+            "random_page_cost": "1.5"
+        })
+    })
+
+
+def test_db_storage_uses_gp3_with_autoscaling_and_alarms():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_allocated_storage=400,
+        db_iops=12000,
+        db_storage_throughput=500,
+        db_max_allocated_storage=1000
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "StorageType": "gp3",
+        "AllocatedStorage": "400",
+        "Iops": 12000,
+        "StorageThroughput": 500,
+        "MaxAllocatedStorage": 1000
+    })
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {"MetricName": "DiskQueueDepth"})
+
+
+def test_gp2_storage_alarms_on_burst_balance():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk", db_storage_type="gp2")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::CloudWatch::Alarm", {"MetricName": "BurstBalance"})
+
+
+def test_gp3_throughput_below_400_gib_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", db_storage_throughput=250)
+
+
+def test_performance_insights_default_on_outside_burstable_profile():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk", db_performance_profile="general-purpose")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "EnablePerformanceInsights": True,
+        "PerformanceInsightsRetentionPeriod": 7
+    })
+    template.has_resource_properties("AWS::RDS::DBParameterGroup", {
+        "Parameters": assertions.Match.object_like({"shared_preload_libraries": "pg_stat_statements"})
+    })
+    template.has_output("DBPerformanceInsightsResourceId", {})
+
+
+def test_performance_insights_default_off_for_burstable_profile():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk")
+    template = assertions.Template.from_stack(stack)
+
+    assert "DBPerformanceInsightsResourceId" not in template.find_outputs("*")
+
+
+def test_nginx_listen_backlog_above_somaxconn_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", nginx_listen_backlog=8192)
+
+
+def test_memory_optimized_replicas_under_burstable_primary():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_read_replicas=1,
+        db_replica_performance_profile="memory-optimized"
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "SourceDBInstanceIdentifier": assertions.Match.any_value(),
+        "DBInstanceClass": "db.r6g.large",
+        "EnablePerformanceInsights": True,
+        "PerformanceInsightsRetentionPeriod": 7
+    })
+    template.has_output("DBReader0PerformanceInsightsResourceId", {})
+    assert "DBPerformanceInsightsResourceId" not in template.find_outputs("*")
+
+
+def test_api_instances_use_ec2_health_checks_until_opted_into_elb():
+    app = core.App()
+    default_stack = ExampleDeploymentCdkStack(app, "default-stack")
+    elb_stack = ExampleDeploymentCdkStack(app, "elb-stack", api_elb_health_check=True)
+
+    assertions.Template.from_stack(default_stack).has_resource_properties("AWS::AutoScaling::AutoScalingGroup", {
+        "HealthCheckType": "EC2"
+    })
+    assertions.Template.from_stack(elb_stack).has_resource_properties("AWS::AutoScaling::AutoScalingGroup", {
+        "HealthCheckType": "ELB"
+    })
+
+
+def test_db_iops_on_gp2_is_rejected():
+    app = core.App()
+    with pytest.raises(ValueError):
+        ExampleDeploymentCdkStack(app, "example-deployment-cdk", db_storage_type="gp2", db_iops=3000)
+
+
+def test_db_io2_storage_is_provisioned():
+    app = core.App()
+    stack = ExampleDeploymentCdkStack(app, "example-deployment-cdk",
+        db_storage_type="io2",
+        db_iops=5000
+    )
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::RDS::DBInstance", {
+        "StorageType": "io2",
+        "Iops": 5000
+    })
+    template.has_resource_properties("AWS::RDS::DBParameterGroup", {
+        "Parameters": assertions.Match.object_like({"random_page_cost": "1.1"})
+    })
@@ -0,0 +1,68 @@
+import pytest
+
+from example_deployment_cdk.nginx import UVICORN_SOCKET, MicroCache, NginxSettings, render_nginx_conf
+
+
+def test_nginx_proxies_to_uvicorn_socket_with_keepalive():
+    conf = render_nginx_conf(NginxSettings(worker_connections=8192, upstream_keepalive=64))
+
+    assert f"server unix:{UVICORN_SOCKET} fail_timeout=0;" in conf
+    assert "keepalive 64;" in conf
+    assert "worker_connections 8192;" in conf
+    assert 'proxy_set_header Connection "";' in conf
+    assert "proxy_buffering on;" in conf
+    assert "listen 80 default_server;" in conf
+
+
+def test_nginx_listen_backlog_is_rendered_when_set():
+    conf = render_nginx_conf(NginxSettings(listen_backlog=4096))
+
+    assert "listen 80 default_server backlog=4096;" in conf
+
+
+def test_nginx_settings_are_validated():
+    with pytest.raises(ValueError):
+        NginxSettings(worker_connections=0)
+
+
+def test_location_directives_render_per_path():
+    conf = render_nginx_conf(NginxSettings(location_directives={
+        "/api/results/*": ["proxy_hide_header Cache-Control;"],
+        "/api/status": [],
+    }))
+
+    assert "location ^~ /api/results/ {" in conf
+    assert "location = /api/status {" in conf
+    assert conf.index("location ^~ /api/results/") < conf.index("location / {")
+    assert conf.count("proxy_pass http://uvicorn;") == 3
+
+
+def test_micro_cache_coalesces_requests_on_configured_paths():
+    conf = render_nginx_conf(NginxSettings(micro_cache=MicroCache(paths=["/api/listings/*"], ttl_seconds=2)))
+
+    assert "keys_zone=microcache:10m" in conf
+    location = conf[conf.index("location ^~ /api/listings/"):conf.index("location / {")]
+    assert "proxy_cache microcache;" in location
+    assert "proxy_cache_valid 200 2s;" in location
+    assert "proxy_cache_lock on;" in location
+    assert "proxy_cache_use_stale updating" in location
+    assert "proxy_cache microcache;" not in conf[conf.index("location / {"):]
+
+
+def test_micro_cache_skips_authenticated_requests():
+    location = "\n".join(MicroCache(paths=["/api/listings/*"]).directives())
+
+    assert "proxy_cache_bypass $http_authorization $cookie_sessionid;" in location
+    assert "proxy_no_cache $http_authorization $cookie_sessionid;" in location
+
+
+def test_micro_cache_is_off_by_default():
+    assert "proxy_cache" not in render_nginx_conf(NginxSettings())
+
+
+def test_gzip_is_configured_from_settings():
+    conf = render_nginx_conf(NginxSettings(gzip_min_length=2048, gzip_types=("application/json", "text/html")))
+
+    assert "gzip on;" in conf
+    assert "gzip_min_length 2048;" in conf
+    assert "gzip_types application/json;" in conf
@@ -0,0 +1,43 @@
+import pytest
+from aws_cdk import aws_ec2 as ec2
+
+from example_deployment_cdk.postgres_tuning import memory_gib_for, postgres_parameters
+
+
+def test_memory_is_derived_from_instance_class():
+    assert memory_gib_for(ec2.InstanceType("t3.micro")) == 1
+    assert memory_gib_for(ec2.InstanceType("m6g.large")) == 8
+    assert memory_gib_for(ec2.InstanceType("m6g.2xlarge")) == 32
+    assert memory_gib_for(ec2.InstanceType("r6g.large")) == 16
+
+
+def test_memory_settings_scale_with_instance_class():
+    parameters = postgres_parameters(ec2.InstanceType("m6g.large"))
+
+    # 8GiB: 2GiB shared_buffers and 6GiB effective_cache_size, in 8kB pages
+    assert parameters["shared_buffers"] == "262144"
+    assert parameters["effective_cache_size"] == "786432"
+    assert parameters["work_mem"] == "32768"
+    assert parameters["maintenance_work_mem"] == "524288"
+    assert parameters["max_wal_size"] == "4096"
+
+
+def test_planner_settings_follow_storage_type():
+    assert postgres_parameters(ec2.InstanceType("t3.micro"), "gp3")["random_page_cost"] == "1.1"
+    assert postgres_parameters(ec2.InstanceType("t3.micro"), "standard")["effective_io_concurrency"] == "2"
+    with pytest.raises(ValueError):
+        postgres_parameters(ec2.InstanceType("t3.micro"), "sc1")
+
+
+def test_overrides_replace_computed_values():
+    parameters = postgres_parameters(ec2.InstanceType("t3.micro"), overrides={"work_mem": "16384", "jit": "0"})
+
+    assert parameters["work_mem"] == "16384"
+    assert parameters["jit"] == "0"
+
+
+def test_pg_stat_statements_is_preloaded():
+    parameters = postgres_parameters(ec2.InstanceType("t3.micro"))
+
+    assert parameters["shared_preload_libraries"] == "pg_stat_statements"
+    assert parameters["pg_stat_statements.track"] == "top"
@@ -0,0 +1,49 @@
+from example_deployment_cdk.asgi_server import AsgiServerSettings
+from example_deployment_cdk.nginx import UVICORN_SOCKET
+from example_deployment_cdk.os_tuning import kernel_profile_for
+from example_deployment_cdk.user_data import (
+    COMPLETE_LIFECYCLE_ACTION,
+    kernel_tuning_commands,
+    lifecycle_action_commands,
+    render_uvicorn_service,
+    render_uvicorn_socket,
+)
+
+
+def test_uvicorn_socket_is_owned_by_systemd():
+    socket = render_uvicorn_socket(AsgiServerSettings(workers=2, backlog=4096))
+
+    assert f"ListenStream={UVICORN_SOCKET}" in socket
+    assert "SocketGroup=nginx" in socket
+    assert "SocketMode=0660" in socket
+    assert "Backlog=4096" in socket
+
+
+def test_uvicorn_service_reloads_workers_on_sighup():
+    service = render_uvicorn_service(AsgiServerSettings(workers=2, graceful_timeout_seconds=20))
+
+    assert "Requires=uvicorn.socket" in service
+    assert "Type=notify" in service
+    assert "ExecReload=/bin/kill -s HUP $MAINPID" in service
+    assert "KillMode=mixed" in service
+    assert "TimeoutStopSec=25" in service
+
+
+def test_kernel_profile_sets_service_nofile_limit():
+    profile = kernel_profile_for("high-connection-server")
+    service = render_uvicorn_service(AsgiServerSettings(workers=2), profile)
+
+    assert f"LimitNOFILE={profile.nofile}" in service
+    assert "LimitNOFILE" not in render_uvicorn_service(AsgiServerSettings(workers=2))
+    assert "sysctl --system" in kernel_tuning_commands(profile)
+    assert kernel_tuning_commands(kernel_profile_for("default")) == []
+
+
+def test_launch_lifecycle_action_is_completed_after_bootstrap_and_on_boot():
+    commands = lifecycle_action_commands("api-bootstrap")
+    script = commands[1]
+
+    assert "--lifecycle-hook-name api-bootstrap" in script
+    assert "--lifecycle-action-result CONTINUE" in script
+    assert "systemctl enable complete-lifecycle-action.service" in commands
+    assert commands[-1] == COMPLETE_LIFECYCLE_ACTION